@@ -5,11 +5,13 @@ The API
 # Libraries
 ## System
 import time
+import asyncio
 
 ## Local
-from .funcs import get_network, get_language, get_user
-from .methods import call
-from .background import background
+from .funcs import get_network, get_language, get_user, track_method
+from .methods import get_method, call
+from .models import unit_of_work
+from .background import background, ensure_indexes
 
 
 class Request():
@@ -22,7 +24,7 @@ class Request():
         self.token = token
         self.network = get_network(network)
         self.locale = get_language(locale)
-        self.user = get_user(token)
+        self.user = None
 
 
 class API():
@@ -41,8 +43,15 @@ class API():
         self.vk = sets['vk']
         self.google = sets['google']
 
+    async def start(self):
+        """ Prepare the DB & run background processes on the app startup """
+
+        # NOTE: Unique values are checked by the indexes while writing,
+        # so they are created before requests
+        await asyncio.to_thread(ensure_indexes)
+
         # Background processes
-        background(self.sio)
+        await background(self.sio)
 
     async def method(
         self,
@@ -61,17 +70,23 @@ class API():
 
         # print(name, data, ip, socket, token, network, locale)
 
-        request = Request(ip, socket, token, network, locale)
+        # NOTE: DB calls of the request are counted for the method,
+        # instances are shared & deferred saves are made within the request
+        # NOTE: Unknown methods sent by clients are counted together
+        with track_method(name if get_method(name) else None):
+            async with unit_of_work():
+                request = Request(ip, socket, token, network, locale)
+                request.user = await get_user(token)
 
-        # # Action tracking
+                # # Action tracking
 
-        # action = Action(
-        #     name=name,
-        #     data=data,
-        #     request=request,
-        # }
+                # action = Action(
+                #     name=name,
+                #     data=data,
+                #     request=request,
+                # }
 
-        # action.save()
+                # action.save()
 
-        # API method
-        return await call(name, self, request, data)
+                # API method
+                return await call(name, self, request, data)
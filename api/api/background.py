@@ -10,15 +10,18 @@ from multiprocessing import Process
 ## Local
 from .funcs import online_stop, report
 from .funcs.mongodb import db
+from .models.user import User
+from .models.post import Post
+from .models.review import Review
 from .models.socket import Socket
+from .models.token import Token
+from .models.action import Actions
 
 
 async def reset_online_users(sio):
     """ Reset online users """
 
-    sockets = Socket.get(fields={})
-
-    for socket in sockets:
+    async for socket in Socket.aiter(fields={}):
         await online_stop(sio, socket.id)
 
 def update_server_status():
@@ -38,6 +41,13 @@ def update_server_status():
         time.sleep(60)
 
 
+def ensure_indexes():
+    """ Reconcile declared indexes of the models with the DB """
+
+    for model in (User, Post, Review, Socket, Token, Actions):
+        model.ensure_indexes()
+
+
 async def background(sio):
     """ Background infinite process """
 
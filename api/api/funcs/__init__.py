@@ -9,3 +9,4 @@ from ._codes import get_network, get_language
 from ._generate import generate, generate_password
 from ._online import get_user, online_back, online_start, online_stop
 from ._reports import report
+from ._stats import track_method, get_stats, track_queries, check_queries
@@ -10,55 +10,62 @@ from ..models.token import Token
 from ..models.socket import Socket
 
 
-def _other_sessions(user_id, token=None):
+async def _other_sessions(user_id, token=None):
     """ Checking for open online sessions of the user """
 
     if not user_id:
         if not token:
             return False
 
-        sockets = Socket.get(token=token)
+        return await Socket.aexists(token=token)
 
-    else:
-        sockets = Socket.get(user=user_id)
-
-    return bool(sockets)
+    return await Socket.aexists(user=user_id)
 
-def _online_count():
+async def _online_count():
     """ Counting the total number of online users """
 
-    sockets = Socket.get(fields={'user', 'token'})
-    count = len({socket.user or socket.token for socket in sockets})
+    # NOTE: Sockets of guests are counted by tokens
+    counts = await Socket.aaggregate([
+        {'$group': {'_id': {
+            '$cond': [{'$gt': ['$user', 0]}, '$user', '$token'],
+        }}},
+        {'$count': 'count'},
+    ])
 
-    return count
+    return counts[0]['count'] if counts else 0
 
 
-def get_user(token_id):
+async def get_user(token_id):
     """ Get user object by token """
 
     if token_id is not None:
         try:
-            token = Token.get(ids=token_id, fields={'user'})
+            token = await Token.aget(ids=token_id, fields={'user'})
 
         except:
             token = Token(id=token_id)
-            token.save()
+            await token.asave()
 
         else:
             if token.user:
-                return User.get(ids=token.user)
+                return await User.aget(ids=token.user)
 
     return User()
 
-def online_back(user_id):
+async def online_back(user_id):
     """ Checking how long has been online """
 
-    sockets = Socket.get(user=user_id, fields={})
+    sockets = await Socket.aget(user=user_id, fields={})
 
     if sockets:
         return 0
 
-    user = User.get(ids=user_id, fields={'online.stop'})
+    # NOTE: Only the end of the last session
+    user = await User.aget(
+        ids=user_id,
+        fields={'online.stop'},
+        slices={'online': -1},
+    )
 
     if not user['online']:
         return None
@@ -71,20 +78,27 @@ async def online_start(sio, token_id, socket_id=None):
 
     # TODO: save user data cache in db.sockets
 
-    user = get_user(token_id)
+    user = await get_user(token_id)
 
     # Send socket about all online users to the user
     # TODO: Full info for all / auth / only for admins
 
     if socket_id:
-        sockets_auth = Socket.get(user={'$exists': True}, fields={'user'})
+        sockets_auth = await Socket.aget(
+            user={'$exists': True},
+            fields={'user'},
+        )
         fields = {'id', 'login', 'avatar', 'name', 'surname', 'status'}
-        users_uniq = [
-            User.get(ids=socket.user, fields=fields).json(fields=fields)
-            for socket in sockets_auth
-            if socket.user not in {0, None}
-        ]
-        count = _online_count()
+        users_uniq = []
+
+        for socket in sockets_auth:
+            if socket.user in {0, None}:
+                continue
+
+            user_uniq = await User.aget(ids=socket.user, fields=fields)
+            users_uniq.append(user_uniq.json(fields=fields))
+
+        count = await _online_count()
 
         if count:
             await sio.emit('online_add', {
@@ -93,14 +107,14 @@ async def online_start(sio, token_id, socket_id=None):
             }, room=socket_id)
 
     # Already online
-    already = _other_sessions(user.id, token_id)
+    already = await _other_sessions(user.id, token_id)
 
     # Save current socket with user & token data
     if socket_id:
         changed = False
 
         try:
-            socket = Socket.get(ids=socket_id, fields={'user'})
+            socket = await Socket.aget(ids=socket_id, fields={'user'})
 
         except:
             socket = Socket(
@@ -128,15 +142,16 @@ async def online_start(sio, token_id, socket_id=None):
                 )
 
         if changed:
-            socket.save()
+            await socket.asave()
 
     # Update other sockets by token
 
-    sockets = Socket.get(token=token_id, fields={'user'})
+    sockets = await Socket.aget(token=token_id, fields={'user'})
 
     for socket in sockets:
         socket.user = user.id
-        socket.save()
+
+    await Socket.asave_many(sockets, ordered=False)
 
     # Send sockets
 
@@ -149,7 +164,7 @@ async def online_start(sio, token_id, socket_id=None):
     # TODO: Full info for all / auth / only for admins
     # NOTE: user.json(default=True) -> login, status
 
-    count = _online_count()
+    count = await _online_count()
 
     if user.id:
         data = [user.json(
@@ -170,32 +185,34 @@ async def online_stop(sio, socket_id):
     # TODO: Если сервер был остановлен, отслеживать сессию
 
     try:
-        socket = Socket.get(ids=socket_id)
+        socket = await Socket.aget(ids=socket_id)
     except:
         # NOTE: method "exit" -> socket "disconnect"
         return
 
-    user = get_user(socket.token)
+    user = await get_user(socket.token)
 
     # Update user online info
     if user.id:
-        user.online.append({'start': socket.created, 'stop': time.time()})
-        user.save()
+        await user.apush('online', {
+            'start': socket.created,
+            'stop': time.time(),
+        })
 
     # Delete online session info
-    socket = Socket.get(ids=socket_id)
-    socket.rm()
+    socket = await Socket.aget(ids=socket_id)
+    await socket.arm()
 
     # Other sessions of this user
 
-    other = _other_sessions(user.id, socket.token)
+    other = await _other_sessions(user.id, socket.token)
 
     if other:
         return
 
     # Send sockets about the user to all online users
 
-    count = _online_count()
+    count = await _online_count()
 
     await sio.emit('online_del', {
         'count': count,
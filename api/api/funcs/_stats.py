@@ -0,0 +1,348 @@
+"""
+Statistics of DB requests by API methods
+"""
+
+import time
+import json
+import bisect
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager
+
+from pymongo import monitoring
+
+from ._reports import report
+
+
+# Upper bounds of buckets of seconds
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+# Upper bounds of buckets of counts of DB calls or documents
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 1000)
+# Count of queries of one shape with different values in the request
+# to consider them as made in a loop instead of one query
+REPEATS = 3
+
+
+_usage = ContextVar('usage', default=None)
+# Queries of the request: [(collection, command, condition)]
+_queries = ContextVar('queries', default=None)
+
+
+class BudgetExceeded(AssertionError):
+    """ More DB calls in the request than the budget of the method """
+
+
+def get_shape(value):
+    """ Query without values, so that queries by different IDs are equal """
+
+    if isinstance(value, dict):
+        return {
+            key: get_shape(el)
+            if key.startswith('$') or isinstance(el, dict)
+            else '?'
+            for key, el in value.items()
+        }
+
+    if isinstance(value, (list, tuple)):
+        # NOTE: Only lists of conditions are kept, lists of values are not
+        if value and all(isinstance(el, dict) for el in value):
+            return [get_shape(el) for el in value]
+
+    return '?'
+
+
+class Histogram:
+    """ Counts of values by buckets with the total sum """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        # NOTE: The last bucket is for values over all bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def add(self, value):
+        """ Count the value """
+
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def json(self):
+        """ Buckets by upper bounds, `None` is without the bound """
+
+        return {
+            'buckets': list(zip(self.bounds + (None,), self.counts)),
+            'count': self.count,
+            'sum': self.sum,
+        }
+
+
+class Usage:
+    """ DB calls of the running API method """
+
+    def __init__(self, method):
+        self.method = method
+        self.start = time.time()
+        self.calls = 0
+        self.time = 0
+        self.docs = 0
+        # (collection, command) -> count of calls
+        self.commands = {}
+
+
+class Stats:
+    """ Histograms of DB calls by API methods """
+
+    def __init__(self):
+        # (method, collection, command) -> [time histogram, docs histogram]
+        self.commands = {}
+        # method -> {name -> histogram} of requests of the method
+        self.methods = {}
+        self.lock = threading.Lock()
+
+    def add_call(self, method, collection, command, duration, docs):
+        """ Count the DB call """
+
+        with self.lock:
+            key = (method, collection, command)
+            histograms = self.commands.get(key)
+
+            if histograms is None:
+                histograms = self.commands[key] = [
+                    Histogram(TIME_BUCKETS),
+                    Histogram(COUNT_BUCKETS),
+                ]
+
+            histograms[0].add(duration)
+            histograms[1].add(docs)
+
+    def add_request(self, usage):
+        """ Count the DB usage of the request of the API method """
+
+        with self.lock:
+            histograms = self.methods.get(usage.method)
+
+            if histograms is None:
+                histograms = self.methods[usage.method] = {
+                    'time': Histogram(TIME_BUCKETS),
+                    'db_time': Histogram(TIME_BUCKETS),
+                    'db_calls': Histogram(COUNT_BUCKETS),
+                    'db_docs': Histogram(COUNT_BUCKETS),
+                }
+
+            histograms['time'].add(time.time() - usage.start)
+            histograms['db_time'].add(usage.time)
+            histograms['db_calls'].add(usage.calls)
+            histograms['db_docs'].add(usage.docs)
+
+    def json(self):
+        """ Histograms of API methods from the most DB time consuming """
+
+        with self.lock:
+            methods = {
+                method: {
+                    name: histogram.json()
+                    for name, histogram in histograms.items()
+                }
+                for method, histograms in self.methods.items()
+            }
+            commands = [
+                {
+                    'method': method,
+                    'collection': collection,
+                    'command': command,
+                    'time': histograms[0].json(),
+                    'docs': histograms[1].json(),
+                }
+                for (method, collection, command), histograms
+                in self.commands.items()
+            ]
+
+        commands.sort(key=lambda el: el['time']['sum'], reverse=True)
+
+        return {
+            'methods': dict(sorted(
+                methods.items(),
+                key=lambda el: el[1]['db_time']['sum'],
+                reverse=True,
+            )),
+            'commands': commands,
+        }
+
+
+stats = Stats()
+
+
+def _get_condition(command_name, command):
+    """ Condition of the DB command or None for commands without it """
+
+    if command_name == 'find':
+        return command.get('filter', {})
+
+    if command_name in ('count', 'distinct', 'findAndModify'):
+        return command.get('query', {})
+
+    if command_name in ('update', 'delete'):
+        requests = command.get(f'{command_name}s') or [{}]
+        return requests[0].get('q', {})
+
+    if command_name == 'aggregate':
+        stages = command.get('pipeline') or [{}]
+        return stages[0].get('$match', {})
+
+    return None
+
+def _get_docs(reply):
+    """ Count of documents returned or changed by the DB command """
+
+    cursor = reply.get('cursor')
+    if isinstance(cursor, dict):
+        return len(cursor.get('firstBatch', cursor.get('nextBatch', ())))
+
+    if 'values' in reply:
+        return len(reply['values'])
+
+    if 'value' in reply:
+        return int(reply['value'] is not None)
+
+    return reply.get('n', 0)
+
+
+class Listener(monitoring.CommandListener):
+    """ Count DB calls for the API method running in the context
+
+    The driver publishes events in the thread of the call, which has
+    the context of the request
+    """
+
+    def __init__(self):
+        # (connection, request) -> collection of the running command
+        self.running = {}
+        self.lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+
+        # NOTE: Continuations of cursors have the collection separately
+        if not isinstance(collection, str):
+            collection = event.command.get('collection')
+
+        with self.lock:
+            self.running[(event.connection_id, event.request_id)] = collection
+
+        queries = _queries.get()
+
+        # NOTE: Continuations of cursors aren't separate queries
+        if queries is not None and event.command_name != 'getMore':
+            queries.append((
+                collection,
+                event.command_name,
+                _get_condition(event.command_name, event.command),
+            ))
+
+    def _finish(self, event, docs):
+        with self.lock:
+            collection = self.running.pop(
+                (event.connection_id, event.request_id), None,
+            )
+
+        duration = event.duration_micros / 1_000_000
+        usage = _usage.get()
+        method = usage.method if usage is not None else None
+
+        stats.add_call(method, collection, event.command_name, duration, docs)
+
+        if usage is not None:
+            with stats.lock:
+                usage.calls += 1
+                usage.time += duration
+                usage.docs += docs
+                key = (collection, event.command_name)
+                usage.commands[key] = usage.commands.get(key, 0) + 1
+
+    def succeeded(self, event):
+        self._finish(event, _get_docs(event.reply))
+
+    def failed(self, event):
+        self._finish(event, 0)
+
+
+@contextmanager
+def track_method(name):
+    """ Attribute DB calls of the context to the API method """
+
+    usage = Usage(name)
+    token = _usage.set(usage)
+
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+        stats.add_request(usage)
+
+def get_stats():
+    """ Statistics of DB calls of the process by API methods """
+
+    return stats.json()
+
+@contextmanager
+def track_queries():
+    """ Remember DB queries of the context """
+
+    queries = []
+    token = _queries.set(queries)
+
+    try:
+        yield queries
+    finally:
+        _queries.reset(token)
+
+def check_queries(method, queries, budget=None, strict=False):
+    """ Report queries of one shape made in a loop & the exceeded budget
+
+    In the strict mode the exceeded budget is raised to fail tests
+    """
+
+    # (collection, command, shape) -> different conditions
+    shapes = {}
+
+    for collection, command, condition in queries:
+        if condition is None:
+            continue
+
+        key = (
+            collection,
+            command,
+            json.dumps(get_shape(condition), sort_keys=True),
+        )
+        conditions = shapes.setdefault(key, [])
+
+        if condition not in conditions:
+            conditions.append(condition)
+
+    for (collection, command, shape), conditions in shapes.items():
+        if len(conditions) >= REPEATS:
+            report.warning(
+                "N+1 queries",
+                {
+                    'method': method,
+                    'collection': collection,
+                    'command': command,
+                    'query': shape,
+                    'count': len(conditions),
+                },
+                tags=['queries'],
+            )
+
+    if budget is not None and len(queries) > budget:
+        if strict:
+            raise BudgetExceeded(
+                f"{method}: {len(queries)} DB queries, budget {budget}"
+            )
+
+        report.warning(
+            "Query budget",
+            {'method': method, 'count': len(queries), 'budget': budget},
+            tags=['queries'],
+        )
@@ -6,6 +6,8 @@ import json
 
 from pymongo import MongoClient
 
+from ._stats import Listener
+
 
 with open('sets.json', 'r') as file:
     sets = json.loads(file.read())['mongo']
@@ -14,6 +16,8 @@ with open('sets.json', 'r') as file:
 params = {
     'host': sets['host'],
     'port': 27017,
+    # NOTE: All DB calls are timed & counted by API methods
+    'event_listeners': [Listener()],
 }
 
 if sets['login'] and sets['password']:
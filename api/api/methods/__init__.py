@@ -7,50 +7,85 @@ import importlib
 import importlib.util
 # import pkgutil
 
+from ..funcs import track_queries, check_queries
+from ..funcs._reports import MODE
+from ..models import Base
 from ..errors import ErrorWrong
 
 
 CURRENT_PATH = str(Path(__file__).parent) + '/'
 CURRENT_MODULE = CURRENT_PATH.replace('/', '.')
 
+# Max counts of DB queries of API methods, checked out of production
+# NOTE: In the test mode the exceeded budget fails the request
+BUDGETS = {}
 
-def _rm_none(data):
-    """ Remove None values """
 
-    if not isinstance(data, dict):
-        return
+def _rm_none(data, depth=2):
+    """ Remove None values of the response
 
-    for field in set(data):
-        if data[field] is None:
-            del data[field]
-            continue
+    Objects are serialized by `.json()`, which already removes None values
+    of subobjects, so only the response and its objects are processed
+    """
 
-        if isinstance(data[field], dict):
-            _rm_none(data[field])
-            continue
+    if isinstance(data, Base):
+        return data.json(fields=data.specified_fields)
 
-        if isinstance(data[field], (list, tuple, set)):
-            for el in data[field]:
-                _rm_none(el)
+    if not depth:
+        return data
 
+    if isinstance(data, dict):
+        return {
+            key: _rm_none(value, depth - 1)
+            for key, value in data.items()
+            if value is not None
+        }
 
-async def call(method, this, request, data):
-    """ Call the API method """
+    if isinstance(data, (list, tuple)):
+        return [_rm_none(el, depth) for el in data]
+
+    return data
+
+
+def get_method(method):
+    """ Handler of the API method or None for the unknown method """
 
     module_name = CURRENT_MODULE + method
-    module_spec = importlib.util.find_spec(module_name)
+
+    # NOTE: Names are sent by clients, so wrong paths are unknown methods
+    try:
+        module_spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
 
     if module_spec is None:
-        raise ErrorWrong('method')
+        return None
 
     module = importlib.import_module(module_name)
-    handle = getattr(module, 'handle')
-    response = await handle(this, request, data)
+    return getattr(module, 'handle')
 
-    # Delete None values
-    _rm_none(response)
+async def call(method, this, request, data):
+    """ Call the API method """
+
+    handle = get_method(method)
+
+    if handle is None:
+        raise ErrorWrong('method')
 
-    return response
+    if MODE == 'PROD':
+        response = await handle(this, request, data)
+
+    # NOTE: Queries in loops are detected in development
+    else:
+        with track_queries() as queries:
+            response = await handle(this, request, data)
+
+        check_queries(
+            method, queries, BUDGETS.get(method), strict=MODE == 'TEST',
+        )
+
+    # Delete None values
+    return _rm_none(response)
 
 
 # for loader, module_name, is_pkg in pkgutil.walk_packages(
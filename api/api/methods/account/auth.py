@@ -3,10 +3,9 @@ The authorization method of the account object of the API
 """
 
 from ...funcs import BaseType, validate, online_start, report
-from ...models.user import User, process_login, process_lower, \
-                           pre_process_phone, process_password
+from ...models.user import User, query_login, process_password
 from ...models.token import Token
-from ...models.action import Action
+from ...models.action import Action, aadd_action
 from ...errors import ErrorInvalid, ErrorWrong, ErrorAccess
 
 
@@ -45,36 +44,14 @@ async def handle(this, request, data):
 
     # Authorize
 
-    new = False
-
-    try:
-        login = process_login(data.login)
-        user = User.get(login=login, fields=fields)[0]
-    except:
-        new = True
-
-    if new:
-        try:
-            mail = process_lower(data.login)
-            user = User.get(mail=mail, fields=fields)[0]
-        except:
-            pass
-        else:
-            new = False
-
-    if new:
-        try:
-            phone = pre_process_phone(data.login)
-            user = User.get(phone=phone, fields=fields)[0]
-        except:
-            pass
-        else:
-            new = False
+    users = await User.aget(query=query_login(data.login), fields=fields)
+    new = not users
 
     # Check password
     if not new:
+        user = users[0]
         password = process_password(data.password)
-        users = User.get(id=user.id, password=password)
+        users = await User.aget(id=user.id, password=password)
 
         if not users:
             raise ErrorWrong('password')
@@ -96,15 +73,15 @@ async def handle(this, request, data):
                 password=data.password,
                 mail=data.login, # TODO: login
                 mail_verified=False,
-                actions=[action.json(default=False)], # TODO: without `.json()`
             )
         except ValueError as e:
             raise ErrorInvalid(e)
 
-        user_data.save()
+        await user_data.asave()
+        await aadd_action(user_data.id, action)
         user_id = user_data.id
 
-        user = User.get(ids=user_id, fields=fields)
+        user = await User.aget(ids=user_id, fields=fields)
 
         # Report
         report.important(
@@ -126,8 +103,7 @@ async def handle(this, request, data):
             },
         )
 
-        user.actions.append(action.json(default=False))
-        user.save()
+        await aadd_action(user.id, action)
 
     # Assignment of the token to the user
 
@@ -135,7 +111,7 @@ async def handle(this, request, data):
         raise ErrorAccess('auth')
 
     try:
-        token = Token.get(ids=request.token, fields={'user'})
+        token = await Token.aget(ids=request.token, fields={'user'})
     except:
         token = Token(id=request.token)
 
@@ -146,7 +122,7 @@ async def handle(this, request, data):
         )
 
     token.user = user.id
-    token.save()
+    token.save(defer=True)
 
     # Update online users
     await online_start(this.sio, request.token)
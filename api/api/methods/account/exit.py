@@ -26,15 +26,15 @@ async def handle(this, request, data):
         raise ErrorAccess('exit')
 
     # Check
-    token = Token.get(ids=request.token, fields={})
+    token = await Token.aget(ids=request.token, fields={})
 
     # Remove
     # TODO: не удалять токены (выданные ботам)
-    token.rm()
+    await token.arm()
 
     # Close session
 
-    sockets = Socket.get(token=request.token, fields={})
+    sockets = await Socket.aget(token=request.token, fields={})
 
     for socket in sockets:
         await online_stop(this.sio, socket.id)
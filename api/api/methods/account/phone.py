@@ -7,7 +7,7 @@ The authorization by phone method of the account object of the API
 from ...funcs import BaseType, validate, online_start, report
 from ...models.user import User, pre_process_phone
 from ...models.token import Token
-from ...models.action import Action
+from ...models.action import Action, aadd_action
 # from ...funcs.smsc import SMSC
 from ...errors import ErrorAccess, ErrorInvalid
 
@@ -43,7 +43,7 @@ async def handle(this, request, data):
 
     phone = pre_process_phone(data.phone)
     new = False
-    users = User.get(phone=phone, fields=fields)
+    users = await User.aget(phone=phone, fields=fields)
 
     if len(users) == 0:
         new = True
@@ -68,15 +68,15 @@ async def handle(this, request, data):
             user_data = User(
                 phone=data.phone,
                 phone_verified=False,
-                actions=[action.json(default=False)],
             )
         except ValueError as e:
             raise ErrorInvalid(e)
 
-        user_data.save()
+        await user_data.asave()
+        await aadd_action(user_data.id, action)
         user_id = user_data.id
 
-        user = User.get(ids=user_id, fields=fields)
+        user = await User.aget(ids=user_id, fields=fields)
 
         # Report
         report.important(
@@ -98,8 +98,7 @@ async def handle(this, request, data):
             },
         )
 
-        user.actions.append(action.json(default=False))
-        user.save()
+        await aadd_action(user.id, action)
 
     # Assignment of the token to the user
 
@@ -107,7 +106,7 @@ async def handle(this, request, data):
         raise ErrorAccess('phone')
 
     try:
-        token = Token.get(ids=request.token, fields={'user'})
+        token = await Token.aget(ids=request.token, fields={'user'})
     except:
         token = Token(id=request.token)
 
@@ -118,7 +117,7 @@ async def handle(this, request, data):
         )
 
     token.user = user.id
-    token.save()
+    token.save(defer=True)
 
     # TODO: Pre-registration data (promos, actions, posts)
 
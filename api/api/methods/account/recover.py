@@ -3,7 +3,7 @@ The password recover method of the account object of the API
 """
 
 from ...funcs import BaseType, validate, generate_password, report
-from ...models.user import User, process_login, process_lower, pre_process_phone
+from ...models.user import User, query_login
 from ...errors import ErrorWrong, ErrorAccess
 
 
@@ -21,39 +21,17 @@ async def handle(this, request, data):
 
     # Get
 
-    new = False
+    users = await User.aget(query=query_login(data.login), fields={})
 
-    try:
-        login = process_login(data.login)
-        user = User.get(login=login, fields={})[0]
-    except:
-        new = True
-
-    if new:
-        try:
-            mail = process_lower(data.login)
-            user = User.get(mail=mail, fields={})[0]
-        except:
-            pass
-        else:
-            new = False
-
-    if new:
-        try:
-            phone = pre_process_phone(data.login)
-            user = User.get(phone=phone, fields={})[0]
-        except:
-            pass
-        else:
-            new = False
-
-    if new:
+    if not users:
         raise ErrorWrong('login')
 
+    user = users[0]
+
     # Update password
     password = generate_password()
     user.password = password
-    user.save()
+    user.save(defer=True)
 
     # Send
     # TODO: send by mail
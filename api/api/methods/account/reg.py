@@ -4,7 +4,7 @@ The registration method of the account object of the API
 from ...funcs import BaseType, validate, online_start, report
 from ...models.user import User
 from ...models.token import Token
-from ...models.action import Action
+from ...models.action import Action, aadd_action
 from ...errors import ErrorAccess, ErrorRepeat
 
 
@@ -55,12 +55,12 @@ async def handle(this, request, data):
             mail=data.mail,
             mail_verified=False,
             social=data.social,
-            actions=[action.json(default=False)],
         )
     except ValueError as e:
         raise ErrorRepeat(e) # TODO: to errors.py
 
-    user.save()
+    await user.asave()
+    await aadd_action(user.id, action)
 
     # Report
     report.important(
@@ -82,7 +82,7 @@ async def handle(this, request, data):
         user=user.id,
     )
 
-    token.save()
+    await token.asave()
 
     # Update online users
     await online_start(this.sio, request.token)
@@ -31,7 +31,7 @@ async def handle(this, request, data):
         raise ErrorAccess('edit')
 
     # Get
-    user = User.get(ids=request.user.id)
+    user = await User.aget(ids=request.user.id)
 
     # Change fields
 
@@ -52,7 +52,7 @@ async def handle(this, request, data):
     user.language = data.language
 
     # Save
-    user.save()
+    await user.asave()
 
     # Processing
     ## Avatar
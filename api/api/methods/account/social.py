@@ -10,7 +10,7 @@ The authorization via social networks method of the account object of the API
 from ...funcs import BaseType, validate, report # online_start
 from ...models.user import User
 from ...models.token import Token
-from ...models.action import Action
+from ...models.action import Action, aadd_action
 from ...errors import ErrorAccess # ErrorInvalid, ErrorWrong
 
 
@@ -47,7 +47,7 @@ async def handle(this, request, data):
         'status',
     }
 
-    users = User.get(social={'$elemMatch': {
+    users = await User.aget(social={'$elemMatch': {
         'id': request.network,
         'user': data.user,
     }}, fields=fields)
@@ -63,8 +63,7 @@ async def handle(this, request, data):
             },
         )
 
-        user.actions.append(action.json(default=False))
-        user.save()
+        await aadd_action(user.id, action)
 
     else:
         new = True
@@ -91,10 +90,10 @@ async def handle(this, request, data):
                 'surname': data.surname,
                 'language': request.locale,
             }],
-            actions=[action.json(default=False)], # TODO: without `.json()`
         )
 
-        user.save()
+        await user.asave()
+        await aadd_action(user.id, action)
 
         # Report
         report.important(
@@ -113,7 +112,7 @@ async def handle(this, request, data):
         raise ErrorAccess('auth')
 
     try:
-        token = Token.get(ids=request.token, fields={'user'})
+        token = await Token.aget(ids=request.token, fields={'user'})
     except:
         token = Token(id=request.token)
 
@@ -124,7 +123,7 @@ async def handle(this, request, data):
         )
 
     token.user = user.id
-    token.save()
+    token.save(defer=True)
 
     # Response
     return {
@@ -0,0 +1,17 @@
+"""
+The DB statistics method of the admin object of the API
+"""
+
+from ...funcs import get_stats
+from ...errors import ErrorAccess
+
+
+# pylint: disable=unused-argument
+async def handle(this, request, data):
+    """ Histograms of DB calls of the process by API methods """
+
+    # No access
+    if request.user.status < 6:
+        raise ErrorAccess('stats')
+
+    return get_stats()
@@ -19,7 +19,7 @@ async def handle(this, request, data):
         raise ErrorAccess('delete')
 
     # Get
-    post = Post.get(ids=data.id)
+    post = await Post.aget(ids=data.id)
 
     # Delete
-    post.rm()
+    await post.arm()
@@ -15,6 +15,8 @@ class Type(BaseType):
     count: int = None
     offset: int = None
     search: str = None
+    cursor: int = None
+    total: bool = False
     # TODO: category: int = None
     # TODO: language: Union[str, int] = None
     # TODO: fields: list[str] = None
@@ -46,12 +48,13 @@ async def handle(this, request, data):
     }
 
     # Get
-    posts = Post.get(
+    posts = await Post.aget(
         ids=data.id,
         count=data.count,
         offset=data.offset,
         search=data.search,
         fields=fields,
+        cursor=data.cursor,
         # category=data.category,
         # language=data.language,
     )
@@ -76,7 +79,22 @@ async def handle(this, request, data):
                 post.cont
             ).replace('&nbsp;', ' ')
 
+    # Pagination
+    cursor = None
+    total = None
+
+    if isinstance(posts, list):
+        ## Next page
+        if data.count and len(posts) == data.count:
+            cursor = posts[-1].id
+
+        ## Total count
+        if data.total:
+            total = await Post.acount(search=data.search)
+
     # Response
     return {
         'posts': posts,
+        'cursor': cursor,
+        'total': total,
     }
@@ -28,7 +28,10 @@ async def handle(this, request, data):
     new = False
 
     if data.id:
-        post = Post.get(ids=data.id, fields={})
+        post = await Post.aget(
+            ids=data.id,
+            fields={'name', 'cont'},
+        )
     else:
         post = Post(
             user=request.user.id,
@@ -43,7 +46,7 @@ async def handle(this, request, data):
     # TODO: category
 
     # Save
-    post.save()
+    await post.asave()
 
     # Report
     report.important(
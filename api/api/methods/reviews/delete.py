@@ -19,7 +19,7 @@ async def handle(this, request, data):
         raise ErrorAccess('delete')
 
     # Get
-    review = Review.get(ids=data.id)
+    review = await Review.aget(ids=data.id)
 
     # Delete
-    review.rm()
+    await review.arm()
@@ -15,6 +15,8 @@ class Type(BaseType):
     count: int = None
     offset: int = None
     search: str = None
+    cursor: int = None
+    total: bool = False
     # TODO: fields: list[str] = None
 
 @validate(Type)
@@ -35,14 +37,28 @@ async def handle(this, request, data):
     }
 
     # Get
-    reviews = Review.get(
+    reviews = await Review.aget(
         ids=data.id,
         count=data.count,
         offset=data.offset,
         search=data.search,
         fields=fields,
+        cursor=data.cursor,
     )
 
+    # Pagination
+    cursor = None
+    total = None
+
+    if isinstance(reviews, list):
+        ## Next page
+        if data.count and len(reviews) == data.count:
+            cursor = reviews[-1].id
+
+        ## Total count
+        if data.total:
+            total = await Review.acount(search=data.search)
+
     # Processing
 
     fields = {
@@ -59,7 +75,7 @@ async def handle(this, request, data):
 
             ## User info
             if review.user:
-                user = User.get(ids=review.user, fields=fields)
+                user = await User.aget(ids=review.user, fields=fields)
                 reviews[i]['user'] = user.json(default=False, fields=fields)
 
     else:
@@ -67,10 +83,12 @@ async def handle(this, request, data):
 
         ## User info
         if 'user' in reviews and reviews['user']:
-            user = User.get(ids=reviews['user'], fields=fields)
+            user = await User.aget(ids=reviews['user'], fields=fields)
             reviews['user'] = user.json(default=False, fields=fields)
 
     # Response
     return {
         'reviews': reviews,
+        'cursor': cursor,
+        'total': total,
     }
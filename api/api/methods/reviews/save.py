@@ -20,7 +20,10 @@ async def handle(this, request, data):
     new = False
 
     if data.id:
-        review = Review.get(ids=data.id, fields={})
+        review = await Review.aget(
+            ids=data.id,
+            fields={'name', 'cont'},
+        )
     else:
         review = Review(
             user=request.user.id,
@@ -32,7 +35,7 @@ async def handle(this, request, data):
     review.cont = data.cont # TODO: checking if add
 
     # Save
-    review.save()
+    await review.asave()
 
     # Report
     report.request(
@@ -15,7 +15,7 @@ async def handle(this, request, data):
     """ Block """
 
     # Get user
-    user = User.get(ids=data.id, fields={'status'})
+    user = await User.aget(ids=data.id, fields={'status'})
 
     # No access
     if request.user.status < 6 or user.status > request.user.status:
@@ -23,7 +23,7 @@ async def handle(this, request, data):
 
     # Save
     user.status = 1
-    user.save()
+    user.save(defer=True)
 
     # Response
     return {
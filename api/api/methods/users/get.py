@@ -13,14 +13,14 @@ class Type(BaseType):
     id: Union[int, list[int]] = None
     count: int = None
     offset: int = None
+    cursor: int = None
     fields: list[str] = None
+    total: bool = False
 
 @validate(Type)
 async def handle(this, request, data):
     """ Get """
 
-    # TODO: cursor
-
     # No access
     if request.user.status < 2:
         raise ErrorAccess('get')
@@ -69,29 +69,50 @@ async def handle(this, request, data):
             # 'phone',
         }
 
+    # NOTE: Paths inside the available fields, e.g. `social.id`
     if data.fields:
-        fields = fields & set(data.fields)
+        fields = {
+            field
+            for field in data.fields
+            if field.partition('.')[0] in fields
+        }
 
     # Get
-    users = User.get(
+    users = await User.aget(
         ids=data.id,
         count=data.count,
         offset=data.offset,
         fields=fields,
+        cursor=data.cursor,
     )
 
+    # Pagination
+    cursor = None
+    total = None
+
+    if isinstance(users, list):
+        ## Next page
+        if data.count and len(users) == data.count:
+            cursor = users[-1].id
+
+        ## Total count
+        if data.total:
+            total = await User.acount()
+
     # Processing
     # NOTE: user.json(default=True) -> login, status
     if isinstance(users, list):
         for i, user in enumerate(users):
             user = user.json(fields=fields)
-            user['online'] = online_back(user['id'])
+            user['online'] = await online_back(user['id'])
             users[i] = user
     else:
         users = users.json(fields=fields)
-        users['online'] = online_back(users['id'])
+        users['online'] = await online_back(users['id'])
 
     # Response
     return {
         'users': users,
+        'cursor': cursor,
+        'total': total,
     }
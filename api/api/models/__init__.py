@@ -2,134 +2,41 @@
 Base model of DB object
 """
 
+import re
 import time
 import json
 from abc import abstractmethod
-from typing import Union, Optional, Any, Callable, List, Tuple, Set
-from copy import deepcopy
+from typing import Union, Optional, List, Tuple, Set
+
+from pymongo.errors import DuplicateKeyError
 
 from ..funcs import generate
 from ..funcs.mongodb import db
-from ..errors import ErrorInvalid, ErrorWrong, ErrorUnsaved
-
-
-def _next_id(name):
-    """ Next DB ID """
-
-    last = list(db[name].find().sort('id', -1).limit(1))
-
-    if last:
-        return last[0]['id'] + 1
-
-    return 1
-
-def _search(value, search):
-    """ Search for matches by value """
-
-    if isinstance(value, str):
-        return search in value.lower()
-
-    if isinstance(value, (int, float)):
-        return search.isdigit() and int(search) == value
-
-    if isinstance(value, (list, tuple, set)):
-        for el in value:
-            if _search(el, search):
-                return True
-        return False
-
-    if isinstance(value, dict):
-        for el in value.values():
-            if _search(el, search):
-                return True
-        return False
-
-    return False
-
-def pre_process_time(cont):
-    """ Time pre-processing """
-
-    if isinstance(cont, int):
-        return float(cont)
-
-    return cont
-
-
-class Attribute:
-    """ Descriptor """
-
-    name: str = None
-    types: Any = None
-    default: Any = None
-    checking: Callable = None
-    pre_processing: Callable = None
-    processing: Callable = None
-
-    def __init__(
-        self,
-        types,
-        default=None,
-        checking=None,
-        pre_processing=None,
-        processing=None,
-    ):
-        self.types = types
-        self.default = default
-        self.checking = checking
-        self.pre_processing = pre_processing
-        self.processing = processing
-
-    def __set_name__(self, instance, name):
-        self.name = name
-
-    def __get__(self, instance, owner):
-        if not instance:
-            if isinstance(self.default, Callable):
-                return self.default(owner)
-
-            return deepcopy(self.default)
-
-        if self.name in instance.__dict__:
-            return instance.__dict__[self.name]
-
-        if self.default is not None:
-            if isinstance(self.default, Callable):
-                instance.__dict__[self.name] = self.default(instance)
-            else:
-                instance.__dict__[self.name] = deepcopy(self.default)
-
-            return instance.__dict__[self.name]
-
-        return None
-
-    def __set__(self, instance, value) -> None:
-        # NOTE: Or we can delete the attribute by `=None`,
-        # but there could be problem if we just passed undeclared parameter
-        if value is None:
-            return
-
-        if self.pre_processing:
-            value = self.pre_processing(value)
-
-        if not isinstance(value, self.types):
-            raise TypeError(self.name)
-
-        if self.checking and not self.checking(instance.id, value):
-            raise ValueError(self.name)
-
-        if self.processing:
-            value = self.processing(value)
-
-        instance.__dict__[self.name] = value
-
-    def __delete__(self, instance):
-        if self.name in instance.__dict__:
-            del instance.__dict__[self.name]
-
-class Base:
+from ..errors import ErrorInvalid, ErrorWrong, ErrorUnsaved, ErrorRepeat
+from . import _search, _cache, _slow
+from ._ids import IDS_BLOCK, next_id
+from ._fields import MISSING, rm_none, pre_process_time, Attribute, Schema
+from ._projection import get_tree, trim, narrow, trim_sliced, get_fields
+from ._indexes import IndexesMixin
+from ._partial import PartialMixin
+from ._bulk import BulkMixin
+from ._atomic import AtomicMixin
+from ._awaitable import AwaitableMixin
+from ._identity import get_identity, unit_of_work
+from ._query import Query, check_field
+
+
+class Base(
+    PartialMixin,
+    IndexesMixin,
+    BulkMixin,
+    AtomicMixin,
+    AwaitableMixin,
+    metaclass=Schema,
+):
     """ Base model """
 
-    id = Attribute(types=int, default=0) # TODO: unique
+    id = Attribute(types=int, default=0, unique=True)
     name = Attribute(types=str) # TODO: required
     user = Attribute(types=int, default=0)
     created = Attribute(types=float, pre_processing=pre_process_time)
@@ -143,12 +50,24 @@ class Base:
 
         return None
 
-    # Loaded fields and values of an instance from DB
-    _loaded_values: dict = None
-    # Specified fields on getting
-    _specified_fields: set = None
+    # Fields of the class: name -> attribute
+    _fields: dict = {}
+    # Values of the new instance by positions of the fields
+    _empty: tuple = ()
+    # Fields of the class for serialization: ((name, attribute), ...)
+    _serialized: tuple = ()
     # Fields of the class for searching
     _search_fields: set = {'name'}
+    # Fields not got by default, only if they are specified or accessed
+    _heavy_fields: set = set()
+    # Compound indexes: `{'fields': [(field, direction), ...], **options}`
+    _indexes: tuple = ()
+    # Max count of cached instances by IDs in the process, `0` to disable
+    _cache_size: int = 0
+    # Seconds of keeping cached instances
+    # NOTE: Changes from other processes are visible only after this time,
+    # so it's not for objects of authorization & access, e.g. tokens, users
+    _cache_ttl: float = 60
 
     def __init__(
         self,
@@ -159,10 +78,19 @@ class Base:
         if not data:
             data = kwargs
 
+        object.__setattr__(self, '_values', list(self._empty))
+        object.__setattr__(self, '_dirty', {})
+        object.__setattr__(self, '_partial_fields', None)
+        object.__setattr__(self, '_batch', None)
+
         # Save the loaded values from DB for further saving only changed ones
+        # NOTE: Values are not copied and not used for finding changes
         if fields is not None:
-            self._loaded_values = deepcopy(data)
-            self._specified_fields = fields or None
+            object.__setattr__(self, '_loaded_values', data)
+            object.__setattr__(self, '_specified_fields', fields or None)
+        else:
+            object.__setattr__(self, '_loaded_values', None)
+            object.__setattr__(self, '_specified_fields', None)
 
         # Autocomplete
         # NOTE: Instead of `Attribute(auto=...)`
@@ -174,16 +102,16 @@ class Base:
         if data.get('id', None) is None and self._db is None:
             data['id'] = generate()
 
-        for name, value in data.items():
-            if fields is not None:
-                # Without fields checking & processing
-                self.__dict__[name] = value
-            else:
-                # With fields checking & processing
+        if fields is not None:
+            self._set_values(data)
+
+        else:
+            # With fields checking & processing
+            for name, value in data.items():
                 setattr(self, name, value)
 
     def __setattr__(self, name, value):
-        if not hasattr(self, name):
+        if name not in self._fields and not hasattr(self, name):
             raise AttributeError('key')
 
         super().__setattr__(name, value)
@@ -212,124 +140,125 @@ class Base:
         pass
 
     def __iter__(self):
-        iters = {
-            key: value
-            for key, value in self.__dict__.items()
-            if key[:2] != '__'
-        }
+        for key, attr in self._fields.items():
+            value = self._values[attr.position]
+
+            if value is not MISSING:
+                yield key, value
+
+    def _set_values(self, data):
+        """ Set the loaded values without fields checking & processing """
+
+        # NOTE: Undeclared fields of the document are left in the DB
+        values = self._values
+
+        for name, value in data.items():
+            attr = self._fields.get(name)
+            if attr is not None:
+                values[attr.position] = value
+
+    @property
+    def loaded_values(self):
+        """ Loaded fields and values from the DB, None for the new instance """
 
-        for key, value in iters.items():
-            yield key, value
+        return self._loaded_values
+
+    @property
+    def specified_fields(self):
+        """ Fields specified on getting, None if all fields were got """
+
+        return self._specified_fields
+
+    @property
+    def partial_fields(self):
+        """ Partially loaded fields: name -> (paths inside, slice) """
+
+        return self._partial_fields
 
     def _is_default(self, name):
         """ Check the value for the default value """
 
-        # Get full copy of the instance to restore the dependent default values
-        data = deepcopy(self)
-        delattr(data, name)
-
-        return getattr(self, name) == getattr(data, name)
+        return self._fields[name].is_default(self, getattr(self, name))
 
-    def _is_subobject(self, data):
-        """ Checking for subobject
+    @classmethod
+    def rebuild_search(cls):
+        """ Rebuild the search index from the existing data """
 
-        Theoretically, it is object, which has own model, but without DB
-        Practically, it is dictionary with `id`
-        """
+        if cls._db is None or not cls._search_fields:
+            return
 
-        if (
-            isinstance(data, (list, tuple))
-            and data and isinstance(data[0], dict)
-            and 'id' in data[0]
-        ):
-            return True
+        _search.rebuild(cls._db, cls._search_fields)
 
-        return False
+    @classmethod
+    def _update_search(cls, ids):
+        """ Update the search index of the instances from the DB """
 
-    def _get_changes(self, data):
-        loaded = self._loaded_values or {}
+        if not ids:
+            return
 
-        data_set = {}
-        data_unset = loaded.keys() - data.keys()
-        data_push = {}
-        data_pull = {}
+        db_filter = {
+            '_id': False,
+            'id': True,
+            **{field: True for field in cls._search_fields},
+        }
+        datas = {
+            el['id']: el
+            for el in db[cls._db].find({'id': {'$in': list(ids)}}, db_filter)
+        }
 
-        for key in data:
-            if key in loaded and data[key] == loaded[key]:
-                continue
+        _search.update_many(cls._db, [
+            (id_, datas.get(id_, {}), False)
+            for id_ in ids
+        ], cls._search_fields)
 
-            # TODO: update: -> pull & push
-            if self._is_subobject(data[key]):
-                for el in data[key]:
-                    if key not in loaded or el not in loaded[key]:
-                        if key in data_push:
-                            data_push[key].append(el)
-                        else:
-                            data_push[key] = [el]
+    @classmethod
+    def _get_cache(cls):
+        """ Cache of the collection if it is enabled """
 
-                if key not in loaded:
-                    continue
+        if cls._db is None or not cls._cache_size:
+            return None
 
-                for el in loaded[key]:
-                    if (
-                        key not in data
-                        or el['id'] not in {i['id'] for i in data[key]}
-                    ):
-                        if key in data_pull:
-                            data_pull[key]['id']['$in'].append(el['id'])
-                        else:
-                            data_pull[key] = {'id': {'$in': [el['id']]}}
+        return _cache.get_cache(cls._db, cls._cache_size, cls._cache_ttl)
 
-                continue
+    @classmethod
+    def invalidate(cls, ids):
+        """ Remove the changed instances from the cache
 
-            data_set[key] = data[key]
+        Also for writing the documents by DB requests out of the model
+        """
 
-        # Add subobjects to existing ones
-        # TODO: update: -> pull & push
-        if data_push:
-            fields = {'_id': False, **{field: True for field in data_push}}
-            data_prepush = db[self._db].find_one({'id': self.id}, fields)
+        cache = cls._get_cache()
 
-            # TODO: remake to MongoDB request selection
-            for field in data_prepush:
-                for value in data_prepush[field]:
-                    i = 0
+        if cache is not None:
+            cache.remove(ids)
 
-                    while i < len(data_push[field]):
-                        if data_push[field][i]['id'] == value['id']:
-                            del data_push[field][i]
-                            break
+    @classmethod
+    def cache_stats(cls):
+        """ Hit & miss counters of the cache of the collection """
 
-                        i += 1
+        cache = cls._get_cache()
 
-                if not data_push[field]:
-                    del data_push[field]
+        if cache is None:
+            return None
 
-        return data_set, data_unset, data_push, data_pull
+        return cache.stats()
 
     @classmethod
-    def get(
+    def _get_condition(
         cls,
         ids: Union[list, tuple, set, int, str, None] = None,
-        count: Optional[int] = None,
-        offset: int = 0,
         search: Optional[str] = None,
-        fields: Union[List[str], Tuple[str], Set[str], None] = None,
+        query: Optional[Query] = None,
         **kwargs,
     ):
-        """ Get instances of the object """
-
-        # TODO: key: Callable for complex conditions
-
-        process_one = False
+        """ Make DB condition for getting """
 
         if ids:
             if isinstance(ids, (list, tuple, set)):
                 db_condition = {
-                    'id': {'$in': ids},
+                    'id': {'$in': list(ids)},
                 }
             else:
-                process_one = True
                 db_condition = {
                     'id': ids,
                 }
@@ -340,73 +269,303 @@ class Base:
             for key, value in kwargs.items():
                 db_condition[key] = value
 
+        if query is not None:
+            db_query = query.compile(cls)
+
+            if db_condition and db_query:
+                db_condition = {'$and': [db_condition, db_query]}
+            else:
+                db_condition = db_condition or db_query
+
+        if search:
+            if len(search) < 3:
+                raise ErrorInvalid('search')
+
+            if not cls._search_fields:
+                raise ErrorInvalid('search')
+
+            # Case-insensitive substring of strings or the same number
+            db_search = []
+
+            for field in sorted(cls._search_fields):
+                db_search.append({field: {
+                    '$regex': re.escape(search),
+                    '$options': 'i',
+                }})
+
+                if search.isdigit():
+                    db_search.append({field: int(search)})
+
+            # NOTE: Only the documents with all substrings of the query
+            # from the trigram index are checked
+            db_condition = {
+                '$and': [
+                    db_condition,
+                    {'id': {'$in': _search.find(cls._db, search)}},
+                    {'$or': db_search},
+                ],
+            }
+
+        return db_condition
+
+    @classmethod
+    def count(
+        cls,
+        ids: Union[list, tuple, set, int, str, None] = None,
+        search: Optional[str] = None,
+        **kwargs,
+    ):
+        """ Get the total count of instances for pagination """
+
+        db_condition = cls._get_condition(ids, search, **kwargs)
+
+        # NOTE: Counting by collection metadata without scanning
+        if not db_condition:
+            return db[cls._db].estimated_document_count()
+
+        return db[cls._db].count_documents(db_condition)
+
+    @classmethod
+    def exists(
+        cls,
+        ids: Union[list, tuple, set, int, str, None] = None,
+        search: Optional[str] = None,
+        **kwargs,
+    ):
+        """ Check if there is an instance without getting documents """
+
+        db_condition = cls._get_condition(ids, search, **kwargs)
+
+        # NOTE: Counting stops on the first matched document
+        return bool(db[cls._db].count_documents(db_condition, limit=1))
+
+    @classmethod
+    def distinct(
+        cls,
+        field: str,
+        ids: Union[list, tuple, set, int, str, None] = None,
+        search: Optional[str] = None,
+        **kwargs,
+    ):
+        """ Get unique values of the field of instances by the DB """
+
+        db_condition = cls._get_condition(ids, search, **kwargs)
+        return db[cls._db].distinct(field, db_condition)
+
+    @classmethod
+    def aggregate(cls, pipeline: list):
+        """ Run the aggregation pipeline on the collection of the object
+
+        Results are documents of the last stage, not instances
+        """
+
+        return list(db[cls._db].aggregate(pipeline))
+
+    @classmethod
+    def _get_sort(cls, sort=None):
+        """ Make DB sorting with the `id` order of equal instances """
+
+        db_sort = []
+
+        for key in sort or ():
+            if isinstance(key, str):
+                key = (key, 1)
+
+            name, direction = key
+
+            if direction not in (1, -1):
+                raise ErrorInvalid('sort')
+
+            db_sort.append((check_field(cls, name), direction))
+
+        if all(name != 'id' for name, _ in db_sort):
+            db_sort.append(('id', -1))
+
+        return db_sort
+
+    @classmethod
+    def _get_filter(cls, fields=None, slices=None):
+        """ Make DB projection for getting
+
+        `fields` can be dotted paths inside fields, e.g. `online.stop`,
+        `slices` are windows of list fields like `$slice`:
+        the last / first N elements or `(skip, limit)`
+        """
+
         db_filter = {
             '_id': False,
         }
+        partial = {}
+        paths = {}
+
+        # NOTE: Heavy fields are got only if they are specified
+        if fields is None and cls._heavy_fields:
+            fields = cls._fields.keys() - cls._heavy_fields
 
         if fields is not None:
             # Add `id` for further saving the instance
             # NOTE: Leave `id` in `fields` for fields selections in the end
-            fields = set(fields)
-            fields.add('id')
-
-            for field in fields:
-                db_filter[field] = True
+            paths = get_tree(fields)
+            paths['id'] = None
+            fields = set(paths)
 
-            if search:
-                for field in cls._search_fields:
-                    db_filter[field] = True
+        for key, window in (slices or {}).items():
+            if isinstance(window, (list, tuple)):
+                window = tuple(window)
 
-        res = db[cls._db].find(db_condition, db_filter)
-        els = []
+            partial[key] = (None, window)
 
-        if search:
-            if len(search) < 3:
-                raise ErrorInvalid('search')
-
-            search = search.lower()
-
-            for el in res:
-                match = False
+            if fields is not None and key not in fields:
+                fields.add(key)
+                paths[key] = None
 
-                for field in cls._search_fields:
-                    if field in el:
-                        if _search(el[field], search):
-                            match = True
-                            break
+        for key, inside in paths.items():
+            if inside is not None:
+                window = partial.get(key, (None, None))[1]
+                partial[key] = (frozenset(inside), window)
 
-                if match:
-                    els.append(el)
-
-            els.sort(key=lambda el: el['id'], reverse=True)
+        for key in fields or ():
+            if key in partial and partial[key][1] is not None:
+                continue
 
-        else:
-            els = res.sort('id', -1)
+            if key in partial:
+                for path in partial[key][0]:
+                    db_filter[f'{key}.{path}'] = True
+            else:
+                db_filter[key] = True
+
+        # NOTE: Paths inside the sliced list are left after getting,
+        # because the DB can't combine them
+        for key, (_, window) in partial.items():
+            if window is not None:
+                db_filter[key] = {
+                    '$slice': list(window) if isinstance(window, tuple)
+                    else window,
+                }
 
-        if offset is None:
-            offset = 0
+        return fields, partial, db_filter
 
-        last = count + offset if count else None
-        els = els[offset:last]
+    @classmethod
+    def _load(cls, data, fields=None, partial=None, batch=None):
+        """ Make the instance from the loaded data """
 
         # `fields` to indicate:
         # 1. that the instance was loaded and avoid unnecessary data saving
         # 2. what fields were requested and use it for `reload`
         # NOTE: `fields={}` to not confuse unloaded and loaded with fields
         # NOTE: `fields` can't be partially loaded with `{}`, only `{'id'}`
-        els = list(map(lambda el: cls(
-            data=el,
+        el = cls(
+            data=data,
             fields=fields or {},
-        ), els))
+        )
 
-        # Leave requested attributes, clear of unnecessary ones:
-        # 1. after searching
-        # 2. autocomplete
+        # Leave requested attributes, clear of autocomplete ones
         if fields:
-            for el in els:
-                for key in set(el.__dict__):
-                    if key not in fields and key[0] != '_':
-                        del el.__dict__[key]
+            for key, attr in cls._fields.items():
+                if key not in fields:
+                    el._values[attr.position] = MISSING
+
+        # NOTE: Partially loaded fields aren't written entirely on saving
+        if partial:
+            el._partial_fields = dict(partial)
+
+        # NOTE: Missing fields of partial instances got together
+        # are got by one request
+        if fields and batch is not None:
+            el._batch = batch
+            batch.append(el)
+
+        return el
+
+    @classmethod
+    def get(
+        cls,
+        ids: Union[list, tuple, set, int, str, None] = None,
+        count: Optional[int] = None,
+        offset: int = 0,
+        search: Optional[str] = None,
+        fields: Union[List[str], Tuple[str], Set[str], None] = None,
+        cursor: Optional[int] = None,
+        slices: Optional[dict] = None,
+        query: Optional[Query] = None,
+        **kwargs,
+    ):
+        """ Get instances of the object
+
+        `cursor` is the ID of the last received instance,
+        the next ones are got by the `id` index without skipping
+
+        `query` is the condition with ranges & alternatives, the sorting
+        and the index of the DB request (`Query`)
+
+        `fields` can be dotted paths inside fields, e.g. `{'online.stop'}`,
+        `slices` are windows of list fields, e.g. `{'online': -1}` for the
+        last element or `{'online': (skip, limit)}`. Such partially loaded
+        fields are saved only by pushed elements, changed subobjects
+        and paths inside dictionaries
+
+        Heavy fields of the model (`_heavy_fields`) are got only if they are
+        specified in `fields` or on the first access to them
+
+        Not loaded fields are got on the first access by the blocking request,
+        so coroutines should specify all used `fields` or get them before
+        by `await instance.aload(...)`
+
+        During the request (`unit_of_work`) instances by IDs are the same
+        objects for all getting calls
+
+        Instances by IDs of models with `_cache_size` are got from the cache
+        of the process without the DB request
+        """
+
+        identity = get_identity()
+
+        if identity is None:
+            return cls._get(
+                ids, count, offset, search, fields, cursor, slices, query,
+                **kwargs,
+            )
+
+        if ids and not (count or offset or search or cursor or query or kwargs):
+            return cls._get_identity(identity, ids, fields, slices)
+
+        els = cls._get(
+            ids, count, offset, search, fields, cursor, slices, query,
+            **kwargs,
+        )
+
+        for el in els if isinstance(els, list) else [els]:
+            identity.add(el)
+
+        return els
+
+    @classmethod
+    def _get(
+        cls,
+        ids: Union[list, tuple, set, int, str, None] = None,
+        count: Optional[int] = None,
+        offset: int = 0,
+        search: Optional[str] = None,
+        fields: Union[List[str], Tuple[str], Set[str], None] = None,
+        cursor: Optional[int] = None,
+        slices: Optional[dict] = None,
+        query: Optional[Query] = None,
+        **kwargs,
+    ):
+        """ Get instances of the object from the DB """
+
+        process_one = bool(ids) and not isinstance(ids, (list, tuple, set))
+
+        cache = cls._get_cache()
+        if cache is not None and ids and not (
+            count or offset or search or cursor is not None or query or kwargs
+        ):
+            els = cls._get_cached(cache, ids, fields, slices)
+        else:
+            els = cls._get_db(
+                ids, count, offset, search, fields, cursor, slices, query,
+                **kwargs,
+            )
 
         if process_one:
             if not els:
@@ -419,8 +578,139 @@ class Base:
 
         return els
 
+    @classmethod
+    def _get_cached(cls, cache, ids, fields=None, slices=None):
+        """ Get instances by IDs with the cache of the collection """
+
+        ids = ids if isinstance(ids, (list, tuple, set)) else [ids]
+        fields, partial, db_filter = cls._get_filter(fields, slices)
+
+        # NOTE: The full document is narrowed to the projection
+        # without the DB request
+        if fields is None and not partial:
+            key = None
+        else:
+            key = (
+                frozenset(fields) if fields is not None else None,
+                frozenset(partial.items()),
+            )
+
+        def narrow_cached(data):
+            return narrow(data, fields, partial)
+
+        datas = {}
+        missing = []
+
+        for id_ in dict.fromkeys(ids):
+            data = cache.get(id_, key, narrow_cached)
+
+            if data is None:
+                missing.append(id_)
+            else:
+                datas[id_] = data
+
+        if missing:
+            # NOTE: The documents are not cached if they were changed
+            # during the request
+            epoch = cache.epoch
+            db_condition = {'id': {'$in': missing}}
+
+            with _slow.track(cls._db, db_condition, db_filter):
+                els = list(db[cls._db].find(db_condition, db_filter))
+
+            for el in els:
+                el = trim_sliced(el, partial)
+                cache.set(el['id'], key, el, epoch)
+                datas[el['id']] = el
+
+        batch = []
+
+        return [
+            cls._load(datas[id_], fields, partial, batch)
+            for id_ in sorted(datas, reverse=True)
+        ]
+
+    @classmethod
+    def _get_db(
+        cls, ids=None, count=None, offset=0, search=None, fields=None,
+        cursor=None, slices=None, query=None, **kwargs,
+    ):
+        """ Get instances of the object by the DB request """
+
+        db_condition = cls._get_condition(ids, search, query, **kwargs)
+        sort, hint = (query.sorting, query.index) if query else ((), None)
+
+        if cursor is not None:
+            # NOTE: The cursor is the position only in the `id` order
+            if sort:
+                raise ErrorInvalid('cursor')
+
+            db_condition = {
+                '$and': [
+                    db_condition,
+                    {'id': {'$lt': cursor}},
+                ],
+            }
+
+        fields, partial, db_filter = cls._get_filter(fields, slices)
+
+        # NOTE: Sorting & pagination are made by the DB with indexes
+        db_sort = cls._get_sort(sort)
+        els = db[cls._db].find(db_condition, db_filter).sort(db_sort)
+
+        if hint is not None:
+            els = els.hint(hint)
+
+        if offset:
+            els = els.skip(offset)
+
+        if count:
+            els = els.limit(count)
+
+        with _slow.track(cls._db, db_condition, db_filter, db_sort, hint):
+            els = list(els)
+
+        batch = []
+
+        return [
+            cls._load(trim_sliced(el, partial), fields, partial, batch)
+            for el in els
+        ]
+
+    @classmethod
+    def iter(
+        cls,
+        ids: Union[list, tuple, set, None] = None,
+        search: Optional[str] = None,
+        fields: Union[List[str], Tuple[str], Set[str], None] = None,
+        batch_size: int = 100,
+        slices: Optional[dict] = None,
+        query: Optional[Query] = None,
+        **kwargs,
+    ):
+        """ Iterate over instances of the object
+
+        Instances are loaded by batches from the DB cursor,
+        so the memory does not depend on the count of documents
+        """
+
+        db_condition = cls._get_condition(ids, search, query, **kwargs)
+        fields, partial, db_filter = cls._get_filter(fields, slices)
+        sort, hint = (query.sorting, query.index) if query else ((), None)
+
+        els = db[cls._db].find(db_condition, db_filter).sort(
+            cls._get_sort(sort)
+        )
+
+        if hint is not None:
+            els = els.hint(hint)
+
+        for el in els.batch_size(batch_size):
+            yield cls._load(trim_sliced(el, partial), fields, partial)
+
     def save(
         self,
+        defer: bool = False,
     ):
         """ Save the instance
 
@@ -434,70 +724,93 @@ class Base:
         2. unspecified subobjects won't be deleted,
         3. the order of subobjects won't be changed.
         To delete subobjects, use `.rm_sub()`
-        """
-
-        exists = db[self._db].count_documents({'id': self.id})
 
-        # Update time
-        self.updated = time.time()
+        Only changed fields are written: set ones, got dictionaries and lists
+        changed in place (added elements are pushed without the whole list).
+        Changes inside elements of lists are not tracked,
+        so the list should be set again, e.g. `user.social = [...]`
 
-        # Update
-        if exists:
-            data = self.json(default=False)
+        If `defer` is True, during the request (`unit_of_work`)
+        the instance will be saved at the end with other deferred ones
 
-            # Only changes
-            data_set, data_unset, data_push, data_pull = self._get_changes(data)
+        Only new instances are created, the loaded one is updated,
+        and if it has been deleted from DB, `ErrorUnsaved` is raised
+        """
 
-            # Update in DB
+        identity = get_identity()
 
-            db_request = {
-                '$set': data_set,
-            }
+        if defer and identity is not None:
+            # NOTE: `id` is needed right away for dependent objects
+            if self.id == 0:
+                self.id = next_id(self._db)
 
-            if data_unset:
-                db_request['$unset'] = {
-                    key: ''
-                    for key in data_unset
-                }
+            identity.defer(self)
+            return
 
-            if data_push:
-                db_request['$push'] = {
-                    key: {'$each': value}
-                    for key, value in data_push.items()
-                }
+        self._ensure_unique()
 
-            if data_pull:
-                db_request['$pull'] = data_pull
+        # Update time
+        self.updated = time.time()
 
-            db[self._db].update_one({'id': self.id}, db_request)
+        # NOTE: `id` may not be int
+        if self.id == 0:
+            self.id = next_id(self._db)
 
-            # Update saved fields
-            self._loaded_values = data
+        # Only changes
+        changes = self._get_changes()
 
-            return
+        # Create or update in DB by one request
+        # NOTE: Unique values are checked by the indexes while writing
+        try:
+            with _slow.track(self._db, {'id': self.id}):
+                res = db[self._db].update_one(
+                    {'id': self.id},
+                    self._get_request(*changes),
+                    upsert=self._loaded_values is None,
+                )
+        except DuplicateKeyError as e:
+            raise ErrorRepeat(self._get_duplicate(e.details, changes)) from e
+
+        # NOTE: The loaded instance isn't restored as a fragment of changes
+        if self._loaded_values is not None and not res.matched_count:
+            raise ErrorUnsaved('id')
 
-        # Create
+        # Update saved fields
+        self._set_saved(changes)
+        self.invalidate([self.id])
 
-        # NOTE: `id` may not be int
-        if self.id == 0:
-            self.id = _next_id(self._db)
+        # Created
+        if res.upserted_id is not None:
+            if identity is not None:
+                identity.replace(self)
 
-        data = self.json(default=False)
-        db[self._db].insert_one(deepcopy(data))
+            _search.update(
+                self._db, self.id, self._loaded_values, self._search_fields,
+                new=True,
+            )
 
-        # Update saved fields
-        self._loaded_values = data
+        elif self._search_fields & set().union(*changes):
+            self._update_search([self.id])
 
     def rm(
         self,
     ):
         """ Delete the instance """
 
-        res = db[self._db].delete_one({'id': self.id}).deleted_count
+        with _slow.track(self._db, {'id': self.id}):
+            res = db[self._db].delete_one({'id': self.id}).deleted_count
+        self.invalidate([self.id])
 
         if not res:
             raise ErrorWrong('id')
 
+        identity = get_identity()
+        if identity is not None:
+            identity.remove(self)
+
+        if self._search_fields:
+            _search.remove(self._db, self.id)
+
     def rm_sub(
         self,
         field: str,
@@ -508,13 +821,10 @@ class Base:
         After calling this function, all unsaved instance data will be erased
         """
 
-        if not db[self._db].count_documents({'id': self.id}):
-            raise ErrorUnsaved('id')
-
         # Update time
         self.updated = time.time()
 
-        db[self._db].update_one(
+        res = db[self._db].update_one(
             {'id': self.id},
             {
                 '$set': {'updated': self.updated},
@@ -522,6 +832,11 @@ class Base:
             }
         )
 
+        if not res.matched_count:
+            raise ErrorUnsaved('id')
+
+        self.invalidate([self.id])
+
         self.reload()
 
         if self._is_default(field):
@@ -529,6 +844,10 @@ class Base:
                 {'id': self.id},
                 {'$unset': {field: ''}}
             )
+            self.invalidate([self.id])
+
+        if field in self._search_fields:
+            self._update_search([self.id])
 
     def json(
         self,
@@ -540,26 +859,49 @@ class Base:
 
         If default is True and there are fields,
         it will return only fields with non-default values
+
+        If none is False, None values are removed from subobjects too,
+        and the dictionary doesn't share containers with the instance
+
+        `fields` can be dotted paths inside fields like on getting
+
+        Fields not loaded from the DB, e.g. heavy ones, are left out
+        instead of default values, `.load()` gets them before
         """
 
         data = {}
+        tree = get_tree(fields) if fields else None
 
-        for attr in dir(self):
-            if fields and attr not in fields:
+        for name, attr in self._serialized:
+            if tree is not None and name not in tree:
                 continue
 
-            value = getattr(self, attr)
-
-            if attr[0] == '_' or callable(value):
+            if not attr.is_loaded(self):
                 continue
 
-            if not default and self._is_default(attr):
+            # NOTE: Loaded containers are copied by `rm_none` if needed
+            value = self._values[attr.position]
+            if value is MISSING:
+                value = attr.make_default(self)
+
+            if not default and attr.is_default(self, value):
                 continue
 
-            if not none and value is None:
+            if value is None:
+                if none:
+                    data[name] = None
                 continue
 
-            data[attr] = value
+            if tree is not None and tree[name] is not None:
+                if not isinstance(value, (dict, list)):
+                    continue
+
+                value = trim(value, tree[name])
+
+            if not none:
+                value = rm_none(value)
+
+            data[name] = value
 
         return data
 
@@ -572,13 +914,24 @@ class Base:
         After calling this function, all unsaved instance data will be erased
         """
 
-        # TODO: Reloading from Partial Object to Object with all fields
+        # NOTE: Other fields of the partial instance are got on access
 
-        fields = fields or self._specified_fields
+        slices = None
+
+        if not fields:
+            fields, slices = get_fields(
+                self._specified_fields, self._partial_fields or {},
+            )
 
         try:
-            data = self.get(ids=self.id, fields=fields)
+            data = self._get(ids=self.id, fields=fields, slices=slices)
         except ErrorWrong as e:
             raise ErrorUnsaved(e)
 
-        self.__dict__ = data.__dict__
+        # NOTE: The dictionary of changes is shared with tracked lists
+        self._values = list(self._empty)
+        self._dirty.clear()
+        self._set_values(data.loaded_values)
+        self._loaded_values = data.loaded_values
+        self._specified_fields = data.specified_fields
+        self._partial_fields = data.partial_fields
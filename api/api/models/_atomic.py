@@ -0,0 +1,177 @@
+"""
+Atomic operations: the document is changed by one request without getting it
+"""
+
+import time
+import asyncio
+
+from pymongo.errors import DuplicateKeyError
+
+from ..funcs.mongodb import db
+from ..errors import ErrorWrong, ErrorUnsaved, ErrorRepeat
+from ._fields import MISSING, rm_none, hybridmethod
+from ._tracking import TrackedList
+
+
+class AtomicMixin:
+    """ Changes of fields by the DB operators
+
+    The instance (if it is passed instead of ID) is updated too
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _update_atomic(cls, target, field, db_request, change):
+        """ Update the field of the document & the loaded instance """
+
+        instance = target if isinstance(target, cls) else None
+        id_ = target.id if instance is not None else target
+        now = time.time()
+
+        db_request.setdefault('$set', {})['updated'] = now
+        cls._ensure_unique()
+
+        try:
+            res = db[cls._db].update_one({'id': id_}, db_request)
+        except DuplicateKeyError as e:
+            raise ErrorRepeat(cls._get_duplicate(e.details, [[field]])) from e
+
+        if not res.matched_count:
+            if instance is not None:
+                raise ErrorUnsaved('id')
+            raise ErrorWrong('id')
+
+        cls.invalidate([id_])
+
+        if field in cls._search_fields:
+            cls._update_search([id_])
+
+        if instance is not None:
+            cls._set_changed(instance, field, change, now)
+
+    def _set_changed(self, field, change, now):
+        """ Make the change of the field written by the DB the loaded one """
+
+        self._set_loaded('updated', now)
+
+        # NOTE: Not loaded fields of the partial instance are not changed
+        if self._specified_fields is None or field in self._specified_fields:
+            attr = self._fields[field]
+            value = self._values[attr.position]
+            if value is MISSING:
+                value = attr.make_default(self)
+
+            self._set_loaded(field, change(value))
+
+    def _set_loaded(self, field, value):
+        """ Set the value as the saved one without marking it as changed """
+
+        attr = self._fields[field]
+        current = self._values[attr.position]
+
+        # NOTE: Not saved changes of the list are still tracked
+        if isinstance(current, TrackedList) and isinstance(value, list):
+            list.__init__(current, value)
+            value = current
+        else:
+            self._dirty.pop(field, None)
+
+        self._values[attr.position] = value
+
+        if self._loaded_values is not None:
+            self._loaded_values[field] = (
+                list(value) if isinstance(value, list) else value
+            )
+
+    # NOTE: The first argument of hybrid methods is the class
+    # pylint: disable=no-self-argument
+
+    @hybridmethod
+    def push(cls, target, field, *values, cap=None):
+        """ Add elements to the end of the list field
+
+        If `cap` is set, only the last `cap` elements are left
+        """
+
+        values = [rm_none(value) for value in values]
+        db_push = {'$each': values}
+
+        if cap is not None:
+            db_push['$slice'] = -cap
+
+        def change(value):
+            value = list(value or []) + values
+            return value[-cap:] if cap is not None else value
+
+        cls._update_atomic(target, field, {'$push': {field: db_push}}, change)
+
+    @hybridmethod
+    def pull(cls, target, field, ids):
+        """ Delete subobjects of the list field by IDs """
+
+        if not isinstance(ids, (list, tuple, set)):
+            ids = [ids]
+
+        ids = list(ids)
+
+        def change(value):
+            return [
+                el
+                for el in value or []
+                if not isinstance(el, dict) or el.get('id') not in ids
+            ]
+
+        cls._update_atomic(
+            target, field, {'$pull': {field: {'id': {'$in': ids}}}}, change,
+        )
+
+    @hybridmethod
+    def inc(cls, target, field, value=1):
+        """ Increase the number field """
+
+        def change(current):
+            return (current or 0) + value
+
+        cls._update_atomic(target, field, {'$inc': {field: value}}, change)
+
+    @hybridmethod
+    def set_field(cls, target, field, value):
+        """ Set the value of the field """
+
+        id_ = target.id if isinstance(target, cls) else target
+        value = cls._fields[field].process(id_, value)
+
+        cls._update_atomic(
+            target, field, {'$set': {field: rm_none(value)}}, lambda _: value,
+        )
+
+    # Awaitable counterparts
+
+    @hybridmethod
+    async def apush(cls, target, *args, **kwargs):
+        """ Add elements to the list without blocking the event loop """
+
+        return await asyncio.to_thread(cls.push, target, *args, **kwargs)
+
+    @hybridmethod
+    async def apull(cls, target, *args, **kwargs):
+        """ Delete subobjects without blocking the event loop """
+
+        return await asyncio.to_thread(cls.pull, target, *args, **kwargs)
+
+    @hybridmethod
+    async def ainc(cls, target, *args, **kwargs):
+        """ Increase the number without blocking the event loop """
+
+        return await asyncio.to_thread(cls.inc, target, *args, **kwargs)
+
+    @hybridmethod
+    async def aset_field(cls, target, *args, **kwargs):
+        """ Set the value of the field without blocking the event loop """
+
+        return await asyncio.to_thread(
+            cls.set_field, target, *args, **kwargs,
+        )
+
+    # pylint: enable=no-self-argument
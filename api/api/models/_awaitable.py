@@ -0,0 +1,83 @@
+"""
+Awaitable counterparts of the DB methods of models
+"""
+
+import asyncio
+import itertools
+
+
+class AwaitableMixin:
+    """ Methods without blocking the event loop
+
+    The driver calls are blocking, so they are run in the thread pool
+    to not stall other requests & sockets of the event loop
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    async def aget(cls, *args, **kwargs):
+        """ Get instances of the object without blocking the event loop """
+
+        return await asyncio.to_thread(cls.get, *args, **kwargs)
+
+    @classmethod
+    async def acount(cls, *args, **kwargs):
+        """ Get the total count of instances without blocking the event loop """
+
+        return await asyncio.to_thread(cls.count, *args, **kwargs)
+
+    @classmethod
+    async def aexists(cls, *args, **kwargs):
+        """ Check if there is an instance without blocking the event loop """
+
+        return await asyncio.to_thread(cls.exists, *args, **kwargs)
+
+    @classmethod
+    async def adistinct(cls, *args, **kwargs):
+        """ Get unique values of the field without blocking the event loop """
+
+        return await asyncio.to_thread(cls.distinct, *args, **kwargs)
+
+    @classmethod
+    async def aaggregate(cls, *args, **kwargs):
+        """ Run the aggregation pipeline without blocking the event loop """
+
+        return await asyncio.to_thread(cls.aggregate, *args, **kwargs)
+
+    @classmethod
+    async def aiter(cls, *args, batch_size: int = 100, **kwargs):
+        """ Iterate over instances without blocking the event loop """
+
+        els = cls.iter(*args, batch_size=batch_size, **kwargs)
+
+        while True:
+            batch = await asyncio.to_thread(
+                lambda: list(itertools.islice(els, batch_size))
+            )
+
+            if not batch:
+                return
+
+            for el in batch:
+                yield el
+
+    async def asave(self, *args, **kwargs):
+        """ Save the instance without blocking the event loop """
+
+        return await asyncio.to_thread(self.save, *args, **kwargs)
+
+    async def arm(self, *args, **kwargs):
+        """ Delete the instance without blocking the event loop """
+
+        return await asyncio.to_thread(self.rm, *args, **kwargs)
+
+    async def arm_sub(self, *args, **kwargs):
+        """ Delete the subobject without blocking the event loop """
+
+        return await asyncio.to_thread(self.rm_sub, *args, **kwargs)
+
+    async def areload(self, *args, **kwargs):
+        """ Update the object from the DB without blocking the event loop """
+
+        return await asyncio.to_thread(self.reload, *args, **kwargs)
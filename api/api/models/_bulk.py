@@ -0,0 +1,223 @@
+"""
+Bulk writing of instances by one DB request
+"""
+
+import time
+import asyncio
+from typing import Union
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ..funcs.mongodb import db
+from ..errors import ErrorWrong, ErrorUnsaved, ErrorRepeat
+from . import _search, _slow
+from ._ids import next_id
+
+
+class BulkMixin:
+    """ Writing & deleting many instances of the model together """
+
+    __slots__ = ()
+
+    @classmethod
+    def save_many(
+        cls,
+        instances: list,
+        ordered: bool = True,
+    ):
+        """ Save the instances by one bulk request
+
+        New instances are created, loaded ones are updated, and if some of
+        them have been deleted from DB, `ErrorUnsaved` is raised after
+        writing the rest. If `ordered` is False, the DB continues with
+        the rest instances after an error and can apply them in any order
+        """
+
+        if not instances:
+            return
+
+        cls._ensure_unique()
+
+        now = time.time()
+        requests = []
+        changes = []
+        loaded = [
+            instance.id
+            for instance in instances
+            if instance.loaded_values is not None
+        ]
+
+        for instance in instances:
+            instance.updated = now
+
+            # NOTE: `id` may not be int
+            if instance.id == 0:
+                instance.id = next_id(cls._db)
+
+            changes.append(cls._get_changes(instance))
+            requests.append(UpdateOne(
+                {'id': instance.id},
+                cls._get_request(*changes[-1]),
+                upsert=instance.loaded_values is None,
+            ))
+
+        try:
+            res = db[cls._db].bulk_write(requests, ordered=ordered)
+        except BulkWriteError as e:
+            # NOTE: Other instances could be written
+            cls.invalidate([instance.id for instance in instances])
+
+            # NOTE: Written changes aren't repeated on the next saving
+            for i in cls._get_bulk_written(e, len(instances), ordered):
+                cls._set_saved(instances[i], changes[i])
+
+            error = cls._get_bulk_duplicate(e)
+            raise ErrorRepeat(
+                cls._get_duplicate(error, changes[error['index']])
+            ) from e
+
+        # NOTE: Loaded instances deleted from DB aren't restored
+        missing = set()
+        if res.matched_count + res.upserted_count < len(instances):
+            missing = set(loaded) - set(db[cls._db].distinct(
+                'id', {'id': {'$in': loaded}},
+            ))
+
+        # Update saved fields
+        for instance, changes_ in zip(instances, changes):
+            if instance.id not in missing:
+                cls._set_saved(instance, changes_)
+
+        cls.invalidate([instance.id for instance in instances])
+
+        created = set(res.upserted_ids)
+
+        _search.update_many(cls._db, [
+            (instance.id, instance.loaded_values, True)
+            for i, instance in enumerate(instances)
+            if i in created
+        ], cls._search_fields)
+        cls._update_search([
+            instance.id
+            for i, instance in enumerate(instances)
+            if i not in created and instance.id not in missing
+            and cls._search_fields & set().union(*changes[i])
+        ])
+
+        if missing:
+            raise ErrorUnsaved('id')
+
+    @classmethod
+    def insert_many(
+        cls,
+        instances: list,
+        ordered: bool = True,
+    ):
+        """ Create the new instances by one bulk request without checking """
+
+        if not instances:
+            return
+
+        cls._ensure_unique()
+
+        datas = []
+
+        for instance in instances:
+            instance.updated = time.time()
+
+            # NOTE: `id` may not be int
+            if instance.id == 0:
+                instance.id = next_id(cls._db)
+
+            datas.append(instance.json(default=False))
+
+        try:
+            db[cls._db].insert_many(
+                [dict(data) for data in datas],
+                ordered=ordered,
+            )
+        except BulkWriteError as e:
+            for i in cls._get_bulk_written(e, len(instances), ordered):
+                cls._set_created(instances[i], datas[i])
+
+            error = cls._get_bulk_duplicate(e)
+            raise ErrorRepeat(
+                cls._get_duplicate(error, [datas[error['index']]])
+            ) from e
+
+        # Update saved fields
+        for instance, data in zip(instances, datas):
+            cls._set_created(instance, data)
+
+        _search.update_many(cls._db, [
+            (instance.id, data, True)
+            for instance, data in zip(instances, datas)
+        ], cls._search_fields)
+
+    @staticmethod
+    def _get_bulk_written(error, count, ordered):
+        """ Indexes of requests written before the error of the bulk request
+
+        The ordered request stops on the first error, the unordered one
+        writes all except the failed ones
+        """
+
+        failed = {el['index'] for el in error.details.get('writeErrors', [])}
+
+        if ordered:
+            return range(min(failed, default=count))
+
+        return [i for i in range(count) if i not in failed]
+
+    @staticmethod
+    def _get_bulk_duplicate(error):
+        """ The first duplicate error of the bulk request or re-raise """
+
+        for el in error.details.get('writeErrors', []):
+            if el.get('code') == 11000:
+                return el
+
+        raise error
+
+    @classmethod
+    def rm_many(
+        cls,
+        ids: Union[list, tuple, set],
+    ):
+        """ Delete the instances by IDs or the instances themselves """
+
+        ids = [el.id if isinstance(el, cls) else el for el in ids]
+
+        if not ids:
+            return
+
+        db_condition = {'id': {'$in': ids}}
+
+        with _slow.track(cls._db, db_condition):
+            res = db[cls._db].delete_many(db_condition).deleted_count
+        cls.invalidate(ids)
+
+        if cls._search_fields:
+            _search.remove_many(cls._db, ids)
+
+        if res != len(set(ids)):
+            raise ErrorWrong('id')
+
+    @classmethod
+    async def asave_many(cls, *args, **kwargs):
+        """ Save the instances without blocking the event loop """
+
+        return await asyncio.to_thread(cls.save_many, *args, **kwargs)
+
+    @classmethod
+    async def ainsert_many(cls, *args, **kwargs):
+        """ Create the instances without blocking the event loop """
+
+        return await asyncio.to_thread(cls.insert_many, *args, **kwargs)
+
+    @classmethod
+    async def arm_many(cls, *args, **kwargs):
+        """ Delete the instances without blocking the event loop """
+
+        return await asyncio.to_thread(cls.rm_many, *args, **kwargs)
@@ -0,0 +1,124 @@
+"""
+Read-through cache of objects by IDs with LRU & TTL eviction
+"""
+
+import time
+import threading
+from copy import deepcopy
+from collections import OrderedDict
+
+
+class Cache:
+    """ Loaded documents of the collection by IDs and projections """
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        # ID -> {projection key or None: (expiration time, document)}
+        # NOTE: The order of IDs is the order of the last usage
+        self.els = OrderedDict()
+        # Number of invalidations to not cache the data loaded before them
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, id_, key=None, narrow=None):
+        """ Get a copy of the document by the projection or None
+
+        The full document is narrowed to the projection by `narrow`
+        """
+
+        now = time.time()
+
+        with self.lock:
+            projections = self.els.get(id_)
+            data = None
+
+            if projections:
+                for projection in (key, None):
+                    if projection in projections:
+                        expires, data = projections[projection]
+
+                        if expires > now:
+                            break
+
+                        del projections[projection]
+                        data = None
+
+            if data is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.els.move_to_end(id_)
+
+        # NOTE: The full document can be narrowed to any projection
+        if key is not None and projection is None:
+            data = narrow(data)
+
+        return deepcopy(data)
+
+    def set(self, id_, key, data, epoch):
+        """ Remember the document of the projection loaded after the `epoch` """
+
+        data = deepcopy(data)
+
+        with self.lock:
+            if epoch != self.epoch:
+                return
+
+            self.els.setdefault(id_, {})[key] = (time.time() + self.ttl, data)
+            self.els.move_to_end(id_)
+
+            while len(self.els) > self.size:
+                self.els.popitem(last=False)
+
+    def remove(self, ids):
+        """ Invalidate the documents """
+
+        with self.lock:
+            self.epoch += 1
+
+            for id_ in ids:
+                self.els.pop(id_, None)
+
+    def clear(self):
+        """ Invalidate all the documents """
+
+        with self.lock:
+            self.epoch += 1
+            self.els.clear()
+
+    def stats(self):
+        """ Hit & miss counters for sizing the cache """
+
+        with self.lock:
+            return {
+                'size': len(self.els),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+# Caches of the process by collections
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name, size, ttl):
+    """ Get the cache of the collection """
+
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = Cache(size, ttl)
+
+        return _caches[name]
+
+def stats():
+    """ Hit & miss counters of all the caches """
+
+    with _caches_lock:
+        caches = dict(_caches)
+
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -0,0 +1,235 @@
+"""
+Changes of instances & DB requests of writing them
+"""
+
+import itertools
+from typing import Optional
+
+from ..errors import ErrorUnsaved
+from ._fields import MISSING, rm_none
+from ._projection import get_paths_changes
+
+
+class ChangesMixin:
+    """ Values of the instance & its changes
+
+    Only changed fields of the instance are written
+    """
+
+    __slots__ = (
+        '_values',
+        '_dirty',
+        '_loaded_values',
+        '_specified_fields',
+        '_partial_fields',
+        '_batch',
+    )
+
+    # Values of the fields by their positions
+    _values: list
+    # Changed fields: name -> added elements of the list or None
+    _dirty: dict
+    # Loaded fields and values of an instance from DB
+    _loaded_values: Optional[dict]
+    # Specified fields on getting
+    _specified_fields: Optional[set]
+    # Partially loaded fields: name -> (dotted paths inside or None, slice)
+    _partial_fields: Optional[dict]
+    # Partial instances got by the same request to get missing fields
+    _batch: Optional[list]
+
+    @staticmethod
+    def _is_subobject(data):
+        """ Checking for subobject
+
+        Theoretically, it is object, which has own model, but without DB
+        Practically, it is dictionary with `id`
+        """
+
+        if (
+            isinstance(data, (list, tuple))
+            and data and isinstance(data[0], dict)
+            and 'id' in data[0]
+        ):
+            return True
+
+        return False
+
+    def _get_changes(self):
+        """ Make changes of the changed fields only
+
+        Subobjects are pushed with all new ones for the instance,
+        existing ones in the DB are skipped by the request itself
+        """
+
+        loaded = self._loaded_values or {}
+        partial_fields = self._partial_fields or {}
+
+        data_set = {}
+        data_unset = set()
+        data_push = {}
+        data_pull = {}
+
+        for key, pushed in self._dirty.items():
+            attr = self._fields[key]
+            value = self._values[attr.position]
+
+            if value is MISSING:
+                value = attr.make_default(self)
+
+            partial = partial_fields.get(key)
+
+            # NOTE: Partially loaded fields can't be written entirely,
+            # only by paths of dictionaries & IDs of subobjects
+            if partial is not None and pushed is None:
+                if isinstance(value, dict) and partial[0] is not None:
+                    get_paths_changes(
+                        key, value, loaded.get(key) or {}, partial[0],
+                        data_set, data_unset,
+                    )
+                    continue
+
+                if not isinstance(value, list) or not all(
+                    isinstance(el, dict) and 'id' in el
+                    for el in itertools.chain(value, loaded.get(key, []))
+                ):
+                    raise ErrorUnsaved(key)
+
+            # NOTE: None & default values are not stored
+            elif value is None or attr.is_default(self, value):
+                data_unset.add(key)
+                continue
+
+            # Only added elements
+            if pushed is not None:
+                data_push[key] = rm_none(pushed)
+                continue
+
+            value = rm_none(value)
+
+            # TODO: update: -> pull & push
+            if partial is not None or self._is_subobject(value):
+                ids = {
+                    el['id']
+                    for el in loaded.get(key, [])
+                    if isinstance(el, dict) and 'id' in el
+                }
+                data_push[key] = [el for el in value if el['id'] not in ids]
+
+                if not data_push[key]:
+                    del data_push[key]
+
+                ids -= {el['id'] for el in value}
+
+                if ids:
+                    data_pull[key] = {'id': {'$in': list(ids)}}
+
+                continue
+
+            data_set[key] = value
+
+        return data_set, data_unset, data_push, data_pull
+
+    def _set_saved(self, changes):
+        """ Make the current values loaded ones after saving the changes """
+
+        if self._loaded_values is None:
+            self._loaded_values = {}
+
+        for key in self._dirty:
+            if key in changes[1]:
+                self._loaded_values.pop(key, None)
+                continue
+
+            # NOTE: Copy of the list to find removed subobjects later
+            value = self._values[self._fields[key].position]
+            if isinstance(value, list):
+                value = list(value)
+
+            self._loaded_values[key] = value
+
+        self._dirty.clear()
+
+    def _set_created(self, data):
+        """ Make the written document the loaded values of the new instance """
+
+        self._loaded_values = data
+        self._dirty.clear()
+
+    @classmethod
+    def _get_request(cls, data_set, data_unset, data_push, data_pull):
+        """ Make DB request of updating by changes
+
+        If there are subobjects to add, the request is a pipeline,
+        which adds only subobjects with IDs not existing in the DB
+        """
+
+        if not any(cls._is_subobject(value) for value in data_push.values()):
+            db_request = {
+                '$set': data_set,
+            }
+
+            if data_unset:
+                db_request['$unset'] = {
+                    key: ''
+                    for key in data_unset
+                }
+
+            if data_push:
+                db_request['$push'] = {
+                    key: {'$each': value}
+                    for key, value in data_push.items()
+                }
+
+            if data_pull:
+                db_request['$pull'] = data_pull
+
+            return db_request
+
+        # NOTE: Values are literal to not process `$` in them as expressions
+        db_set = {
+            key: {'$literal': value}
+            for key, value in data_set.items()
+        }
+
+        for key in data_push.keys() | data_pull.keys():
+            value = {'$ifNull': [f'${key}', []]}
+
+            if key in data_pull:
+                value = cls._get_filter_ids(
+                    value, data_pull[key]['id']['$in'],
+                )
+
+            if key in data_push:
+                added = {'$literal': data_push[key]}
+
+                if cls._is_subobject(data_push[key]):
+                    added = {'$let': {
+                        'vars': {'ids': {'$map': {
+                            'input': value,
+                            'as': 'el',
+                            'in': '$$el.id',
+                        }}},
+                        'in': cls._get_filter_ids(added, '$$ids'),
+                    }}
+
+                value = {'$concatArrays': [value, added]}
+
+            db_set[key] = value
+
+        db_request = [{'$set': db_set}]
+
+        if data_unset:
+            db_request.append({'$project': {key: 0 for key in data_unset}})
+
+        return db_request
+
+    @staticmethod
+    def _get_filter_ids(value, ids):
+        """ DB expression of the subobjects without the IDs """
+
+        return {'$filter': {
+            'input': value,
+            'as': 'el',
+            'cond': {'$eq': [{'$in': ['$$el.id', ids]}, False]},
+        }}
@@ -0,0 +1,270 @@
+"""
+Fields of models: descriptors & the compiled table of fields
+"""
+
+import functools
+from typing import Union, Any, Callable
+from copy import deepcopy
+
+from ._tracking import TrackedList
+
+
+# Value of the field, which is not set
+MISSING = object()
+
+
+def rm_none(value):
+    """ Copy of the value without None values of nested dictionaries """
+
+    if isinstance(value, dict):
+        return {
+            key: rm_none(el)
+            for key, el in value.items()
+            if el is not None
+        }
+
+    if isinstance(value, (list, tuple)):
+        return [rm_none(el) for el in value]
+
+    return value
+
+def pre_process_time(cont):
+    """ Time pre-processing """
+
+    if isinstance(cont, int):
+        return float(cont)
+
+    return cont
+
+
+class Attribute:
+    """ Descriptor
+
+    The value is kept in the storage of the instance by the position
+    of the field, see `Schema`
+    """
+
+    # NOTE: The descriptor is the access to the storage of the instance
+    # pylint: disable=protected-access
+
+    name: str = None
+    types: Any = None
+    default: Any = None
+    checking: Callable = None
+    pre_processing: Callable = None
+    processing: Callable = None
+    index: Union[bool, int] = False
+    unique: bool = False
+    # Position of the value in the instance storage
+    position: int = None
+
+    def __init__(
+        self,
+        types,
+        default=None,
+        checking=None,
+        pre_processing=None,
+        processing=None,
+        index=False, # `True` / direction: `1` / `-1`
+        unique=False,
+    ):
+        self.types = types
+        self.default = default
+        self.checking = checking
+        self.pre_processing = pre_processing
+        self.processing = processing
+        self.index = index
+        self.unique = unique
+
+        # Precomputed making of the default value
+        # NOTE: Only mutable values are copied for each instance
+        if default is None or isinstance(default, Callable):
+            self._make_default = default
+        elif isinstance(default, (list, dict, set)):
+            if default:
+                self._make_default = lambda _: deepcopy(default)
+            else:
+                empty = type(default)
+                self._make_default = lambda _: empty()
+        else:
+            self._make_default = lambda _: default
+
+    def __set_name__(self, instance, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            if self._make_default is None:
+                return None
+
+            return self._make_default(owner)
+
+        values = instance._values
+        value = values[self.position]
+
+        # NOTE: Not loaded fields of the partial instance are got on access
+        if not self.is_loaded(instance):
+            instance.load(self.name)
+            value = values[self.position]
+
+        if value is MISSING:
+            if self._make_default is None:
+                return None
+
+            value = values[self.position] = self._make_default(instance)
+
+        # NOTE: Lists track their changes in place, see `TrackedList`
+        if isinstance(value, list):
+            if not isinstance(value, TrackedList):
+                value = values[self.position] = TrackedList(
+                    value, instance._dirty, self.name,
+                )
+
+        # NOTE: Changes inside dictionaries are not tracked,
+        # so the got dictionary is considered as changed
+        elif isinstance(value, dict):
+            loaded = instance._loaded_values
+
+            # NOTE: Loaded values are shared with `_loaded_values`
+            # and copied only on the first access to keep the loaded state
+            if loaded is not None and loaded.get(self.name) is value:
+                value = values[self.position] = deepcopy(value)
+
+            instance._dirty[self.name] = None
+
+        return value
+
+    def __set__(self, instance, value) -> None:
+        # NOTE: Or we can delete the attribute by `=None`,
+        # but there could be problem if we just passed undeclared parameter
+        if value is None:
+            return
+
+        # NOTE: `instance.field += [...]` is tracked by the list itself
+        if (
+            isinstance(value, TrackedList)
+            and value is instance._values[self.position]
+        ):
+            return
+
+        instance._values[self.position] = self.process(instance.id, value)
+        instance._dirty[self.name] = None
+        self._set_whole(instance)
+
+    def __delete__(self, instance):
+        instance._values[self.position] = MISSING
+        instance._dirty[self.name] = None
+        self._set_whole(instance)
+
+    def _set_whole(self, instance):
+        """ Consider the replaced value as the whole one """
+
+        partial = instance._partial_fields
+
+        if partial and self.name in partial:
+            del partial[self.name]
+
+    def make_default(self, instance):
+        """ Default value of the field for the instance """
+
+        if self._make_default is None:
+            return None
+
+        return self._make_default(instance)
+
+    def process(self, id_, value):
+        """ Check & process the value for the object with the ID """
+
+        if self.pre_processing:
+            value = self.pre_processing(value)
+
+        if not isinstance(value, self.types):
+            raise TypeError(self.name)
+
+        if self.checking and not self.checking(id_, value):
+            raise ValueError(self.name)
+
+        if self.processing:
+            value = self.processing(value)
+
+        return value
+
+    def is_set(self, instance):
+        """ Check that the value is set in the instance """
+
+        return instance._values[self.position] is not MISSING
+
+    def is_loaded(self, instance):
+        """ Check that the value isn't left in the DB by the projection """
+
+        return (
+            instance._values[self.position] is not MISSING
+            or instance._specified_fields is None
+            or self.name in instance._specified_fields
+            or self.name in instance._dirty
+        )
+
+    def is_default(self, instance, value):
+        """ Check the value for the default value of the instance """
+
+        if self.default is None:
+            return value is None
+
+        if isinstance(self.default, Callable):
+            return value == self.default(instance)
+
+        return value == self.default
+
+class hybridmethod:
+    """ Method of the class with the object as the first argument
+
+    `Model.method(id, ...)` for the object by ID,
+    `instance.method(...)` for the instance itself
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return functools.partial(self.func, owner)
+
+        return functools.partial(self.func, owner, instance)
+
+class Schema(type):
+    """ Compiled table of fields of the model
+
+    Values of instances are stored in one list by positions of the fields
+    instead of the instance dictionary
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        # NOTE: Subclasses don't add the instance dictionary
+        namespace.setdefault('__slots__', ())
+
+        cls = super().__new__(mcs, name, bases, namespace)
+        fields = dict(getattr(cls, '_fields', {}))
+
+        for key, value in namespace.items():
+            if not isinstance(value, Attribute):
+                continue
+
+            # NOTE: Redefined fields keep the position of the parent one
+            if key in fields:
+                position = fields[key].position
+            else:
+                position = len(fields)
+
+            if value.position not in (None, position):
+                raise TypeError(key)
+
+            value.position = position
+            fields[key] = value
+
+        cls._fields = fields
+        cls._empty = (MISSING,) * len(fields)
+        # NOTE: Serialized in the alphabetical order
+        cls._serialized = tuple(sorted(fields.items()))
+
+        return cls
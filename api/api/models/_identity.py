@@ -0,0 +1,87 @@
+"""
+Identity map & unit of work of the request
+"""
+
+import asyncio
+from contextvars import ContextVar
+from contextlib import asynccontextmanager
+
+
+_identity = ContextVar('identity', default=None)
+
+
+class Identity:
+    """ Instances loaded & deferred to save during the request """
+
+    def __init__(self):
+        # (model, ID) -> instance
+        self.instances = {}
+        # (model, ID) -> instance
+        self.pending = {}
+
+    def get(self, instance_class, id_):
+        """ Get the loaded instance """
+
+        return self.instances.get((instance_class, id_))
+
+    def add(self, instance):
+        """ Remember the loaded instance if it is not loaded yet """
+
+        return self.instances.setdefault(
+            (type(instance), instance.id), instance,
+        )
+
+    def replace(self, instance):
+        """ Remember the instance instead of the loaded one """
+
+        self.instances[(type(instance), instance.id)] = instance
+
+    def remove(self, instance):
+        """ Forget the instance """
+
+        self.instances.pop((type(instance), instance.id), None)
+        self.pending.pop((type(instance), instance.id), None)
+
+    def defer(self, instance):
+        """ Save the instance at the end of the request """
+
+        self.replace(instance)
+        self.pending[(type(instance), instance.id)] = instance
+
+    def flush(self):
+        """ Save all deferred instances by one bulk request per collection """
+
+        groups = {}
+
+        for instance in self.pending.values():
+            groups.setdefault(type(instance), []).append(instance)
+
+        self.pending = {}
+
+        for instance_class, instances in groups.items():
+            instance_class.save_many(instances)
+
+
+def get_identity():
+    """ Get the identity map of the current request """
+
+    return _identity.get()
+
+@asynccontextmanager
+async def unit_of_work():
+    """ Identity map of the request with saving deferred instances at the end
+
+    Deferred instances are not saved if the request fails
+    """
+
+    identity = Identity()
+    token = _identity.set(identity)
+
+    try:
+        yield identity
+
+        if identity.pending:
+            await asyncio.to_thread(identity.flush)
+
+    finally:
+        _identity.reset(token)
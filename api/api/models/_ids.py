@@ -0,0 +1,69 @@
+"""
+Sequential IDs of objects reserved by blocks
+"""
+
+import os
+import threading
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..funcs.mongodb import db
+
+
+# Count of IDs reserved by the process per one request to the DB
+IDS_BLOCK = 10
+
+# Reserved blocks of IDs by collections: name -> [process, next, last]
+_ids = {}
+_ids_lock = threading.Lock()
+
+
+def _reserve_ids(name, count):
+    """ Reserve the block of IDs and get the last one
+
+    The counter is increased atomically in `db.counters`,
+    so blocks of different processes never intersect
+    """
+
+    counter = db.counters.find_one_and_update(
+        {'_id': name},
+        {'$inc': {'seq': count}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+    if counter:
+        return counter['seq']
+
+    # Start the counter from existing data
+    last = list(
+        db[name].find({}, {'_id': False, 'id': True}).sort('id', -1).limit(1)
+    )
+    last = last[0]['id'] if last else 0
+
+    try:
+        db.counters.update_one(
+            {'_id': name},
+            {'$max': {'seq': last}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # NOTE: The counter has just been created by another process
+        pass
+
+    return _reserve_ids(name, count)
+
+def next_id(name):
+    """ Next DB ID """
+
+    with _ids_lock:
+        process = os.getpid()
+        block = _ids.get(name)
+
+        # NOTE: Blocks are not inherited by forked processes
+        if not block or block[0] != process or block[1] > block[2]:
+            last = _reserve_ids(name, IDS_BLOCK)
+            block = _ids[name] = [process, last - IDS_BLOCK + 1, last]
+
+        block[1] += 1
+        return block[1] - 1
@@ -0,0 +1,166 @@
+"""
+Indexes of collections declared by models
+"""
+
+import re
+import itertools
+import threading
+
+from pymongo.errors import OperationFailure
+
+from ..funcs.mongodb import db
+from ..funcs._reports import report
+from . import _search
+from ._fields import Attribute
+
+
+# Models with unique indexes checked by the process before writing
+_unique_checked = set()
+_unique_lock = threading.Lock()
+
+
+class IndexesMixin:
+    """ Indexes by fields (`index`, `unique`) & compound ones (`_indexes`)
+
+    Unique values are checked by the indexes while writing
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _get_indexes(cls):
+        """ Declared indexes of the collection: {keys: options} """
+
+        attrs = {}
+
+        for parent in reversed(cls.__mro__):
+            for name, attr in vars(parent).items():
+                if isinstance(attr, Attribute):
+                    attrs[name] = attr
+
+        indexes = {}
+
+        for name, attr in attrs.items():
+            if attr.unique:
+                # NOTE: Not stored values must not conflict with each other
+                indexes[((name, 1),)] = {'unique': True, 'sparse': True}
+            elif attr.index:
+                direction = 1 if attr.index is True else attr.index
+                indexes[((name, direction),)] = {}
+
+        for index in cls._indexes:
+            options = dict(index)
+            keys = tuple(tuple(key) for key in options.pop('fields'))
+            indexes[keys] = options
+
+        return indexes
+
+    @classmethod
+    def _get_existing_indexes(cls):
+        """ Indexes of the collection in the DB: {keys: info} """
+
+        existing = {}
+
+        for name, info in db[cls._db].index_information().items():
+            if name == '_id_':
+                continue
+
+            keys = tuple(
+                (field, int(direction))
+                if isinstance(direction, (int, float)) else (field, direction)
+                for field, direction in info['key']
+            )
+            existing[keys] = {'name': name, **info}
+
+        return existing
+
+    @classmethod
+    def _ensure_unique(cls):
+        """ Create missing unique indexes once in the process before writing
+
+        Unique values are checked only by the indexes, so they must exist
+        even if the process hasn't run the startup of the app
+        """
+
+        if cls._db is None or cls in _unique_checked:
+            return
+
+        with _unique_lock:
+            if cls in _unique_checked:
+                return
+
+            existing = cls._get_existing_indexes()
+
+            for keys, options in cls._get_indexes().items():
+                if options.get('unique') and keys not in existing:
+                    db[cls._db].create_index(list(keys), **options)
+
+            _unique_checked.add(cls)
+
+    @classmethod
+    def ensure_indexes(cls):
+        """ Create missing indexes & report extra or mismatched ones """
+
+        if cls._db is None:
+            return
+
+        declared = cls._get_indexes()
+        existing = cls._get_existing_indexes()
+
+        for keys, options in declared.items():
+            if keys not in existing:
+                try:
+                    db[cls._db].create_index(list(keys), **options)
+                except OperationFailure as e:
+                    report.error(
+                        "Index creation",
+                        {'db': cls._db, 'keys': keys, 'error': str(e)},
+                    )
+                continue
+
+            info = existing[keys]
+            mismatched = {
+                option
+                for option in {'unique', 'sparse'} | set(options)
+                if info.get(option, False) != options.get(option, False)
+            }
+
+            if mismatched:
+                report.warning(
+                    "Mismatched index",
+                    {
+                        'db': cls._db,
+                        'index': info['name'],
+                        'options': ', '.join(sorted(mismatched)),
+                    },
+                )
+
+        for keys in existing.keys() - declared.keys():
+            report.warning(
+                "Extra index",
+                {'db': cls._db, 'index': existing[keys]['name']},
+            )
+
+        if cls._search_fields:
+            _search.ensure_indexes()
+
+    @classmethod
+    def _get_duplicate(cls, details, changes):
+        """ Field of the violated unique index by the error details """
+
+        details = details or {}
+
+        if details.get('keyPattern'):
+            return next(iter(details['keyPattern']))
+
+        match = re.search(r'index: (\S+?)_-?1\b', details.get('errmsg', ''))
+        if match:
+            return match.group(1)
+
+        # NOTE: Without the index in the error, the first changed unique field
+        for field in itertools.chain(*changes):
+            attr = cls._fields.get(field)
+            if attr is not None and attr.unique and field != 'id':
+                return field
+
+        return 'id'
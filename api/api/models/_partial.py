@@ -0,0 +1,201 @@
+"""
+Partial instances: fields left in the DB by the projection
+"""
+
+import asyncio
+
+from ._projection import get_fields
+from ._changes import ChangesMixin
+
+
+class PartialMixin(ChangesMixin):
+    """ Not loaded fields are got on access, copies are merged together """
+
+    __slots__ = ()
+
+    def _load_fields(self, *fields):
+        """ Get not loaded fields of the instance from the DB
+
+        All not loaded fields except heavy ones and the specified heavy ones
+        are got by one request for the instance and the partial instances
+        got with it
+        """
+
+        fields = {
+            key
+            for key in self._fields
+            if key not in self._specified_fields
+            and key not in self._dirty
+            and (key in fields or key not in self._heavy_fields)
+        }
+
+        if not fields:
+            return
+
+        instances = [
+            el
+            for el in self._batch or (self,)
+            if el.specified_fields is not None
+            and not fields <= el.specified_fields
+        ]
+        ids = [el.id for el in instances]
+
+        cache = self._get_cache()
+        if cache is not None:
+            els = self._get_cached(cache, ids, fields)
+        else:
+            els = self._get_db(ids, fields=fields)
+
+        els = {el.id: el for el in els}
+
+        for el in instances:
+            # NOTE: The deleted instance has default values
+            el.widen(els.get(el.id) or self._load({'id': el.id}, fields))
+
+    def load(self, *fields):
+        """ Get not loaded fields of the partial instance from the DB
+
+        Without `fields` all not loaded fields except heavy ones are got
+        """
+
+        if self._specified_fields is None:
+            return
+
+        if fields and all(
+            key in self._specified_fields or key in self._dirty
+            for key in fields
+        ):
+            return
+
+        self._load_fields(*fields)
+
+    def widen(self, other):
+        """ Add fields of another loaded copy of the object
+
+        Already loaded or changed fields are not replaced
+        to keep unsaved changes, except partially loaded ones
+        by whole ones
+        """
+
+        partial = self._partial_fields or {}
+        other_partial = other.partial_fields or {}
+
+        if self._specified_fields is None and not partial:
+            return
+
+        for key, value in other.loaded_values.items():
+            attr = self._fields.get(key)
+
+            if attr is None:
+                continue
+
+            if self._specified_fields is None or key in self._specified_fields:
+                if (
+                    key not in partial
+                    or key in other_partial
+                    or key in self._dirty
+                ):
+                    continue
+
+            elif key in self._dirty or (
+                attr.is_set(self) and not self._is_default(key)
+            ):
+                continue
+
+            # NOTE: Loaded values are shared with `_loaded_values`
+            # like in the loaded copy
+            self._values[attr.position] = value
+            self._loaded_values[key] = value
+
+            if key in other_partial:
+                partial[key] = other_partial[key]
+            else:
+                partial.pop(key, None)
+
+        self._partial_fields = partial or None
+
+        if self._specified_fields is None:
+            return
+
+        if other.specified_fields is None:
+            self._specified_fields = None
+        else:
+            self._specified_fields = (
+                self._specified_fields | other.specified_fields
+            )
+
+    @classmethod
+    def _get_identity(cls, identity, ids, fields=None, slices=None):
+        """ Get instances by IDs with the identity map of the request
+
+        Only not loaded instances and not loaded fields are got from the DB
+        """
+
+        process_one = not isinstance(ids, (list, tuple, set))
+        ids = [ids] if process_one else list(dict.fromkeys(ids))
+
+        names, partial, _ = cls._get_filter(fields, slices)
+
+        missing = []
+        narrow = {}
+
+        for id_ in ids:
+            el = identity.get(cls, id_)
+
+            if el is None:
+                missing.append(id_)
+                continue
+
+            if names is None and el.specified_fields is not None:
+                narrow[id_] = None
+                continue
+
+            # NOTE: Fields loaded with another projection are got entirely
+            whole = {
+                key
+                for key, projection in (el.partial_fields or {}).items()
+                if (names is None or key in names)
+                and partial.get(key) != projection
+            }
+
+            if el.specified_fields is None:
+                need = whole
+            else:
+                need = names - el.specified_fields | whole
+
+            if need:
+                narrow[id_] = (need, whole)
+
+        if missing:
+            for el in cls._get(ids=missing, fields=fields, slices=slices):
+                identity.add(el)
+
+        if narrow:
+            # NOTE: One request for all instances with the widest projection
+            widen, widen_slices = None, None
+
+            if None not in narrow.values():
+                need = set().union(*(el[0] for el in narrow.values()))
+                whole = set().union(*(el[1] for el in narrow.values()))
+                widen, widen_slices = get_fields(need, {
+                    key: projection
+                    for key, projection in partial.items()
+                    if key in need and key not in whole
+                })
+
+            for el in cls._get(
+                ids=list(narrow), fields=widen, slices=widen_slices,
+            ):
+                identity.get(cls, el.id).widen(el)
+
+        els = [identity.get(cls, id_) for id_ in ids]
+
+        if process_one:
+            return els[0]
+
+        return sorted(els, key=lambda el: el.id, reverse=True)
+
+    async def aload(self, *args, **kwargs):
+        """ Get not loaded fields without blocking the event loop """
+
+        return await asyncio.to_thread(self.load, *args, **kwargs)
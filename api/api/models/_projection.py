@@ -0,0 +1,137 @@
+"""
+Projections of documents: dotted paths inside fields & windows of lists
+"""
+
+from ._fields import MISSING, rm_none
+
+
+def get_tree(paths):
+    """ Dotted paths as the tree of keys: key -> paths inside or None """
+
+    tree = {}
+
+    for path in paths:
+        key, _, rest = path.partition('.')
+
+        if not rest:
+            tree[key] = None
+        elif tree.get(key, ()) is not None:
+            tree.setdefault(key, set()).add(rest)
+
+    return tree
+
+def trim(value, paths):
+    """ Leave only the dotted paths of the value like the DB projection """
+
+    if isinstance(value, list):
+        return [
+            trim(el, paths)
+            for el in value
+            if isinstance(el, (dict, list))
+        ]
+
+    data = {}
+
+    for key, rest in get_tree(paths).items():
+        if key not in value:
+            continue
+
+        if rest is None:
+            data[key] = value[key]
+        elif isinstance(value[key], (dict, list)):
+            data[key] = trim(value[key], rest)
+
+    return data
+
+def _slice(value, window):
+    """ Window of the list like the `$slice` projection """
+
+    if isinstance(window, int):
+        return value[window:] if window < 0 else value[:window]
+
+    skip, limit = window
+    return value[skip:][:limit]
+
+def narrow(data, fields, partial):
+    """ Projection of the full document """
+
+    data = {
+        key: value
+        for key, value in data.items()
+        if fields is None or key in fields
+    }
+
+    for key, (paths, window) in partial.items():
+        value = data.get(key, MISSING)
+
+        if window is not None and isinstance(value, list):
+            value = _slice(value, window)
+
+        if paths is not None:
+            if isinstance(value, (dict, list)):
+                value = trim(value, paths)
+            else:
+                value = MISSING
+
+        if value is MISSING:
+            data.pop(key, None)
+        else:
+            data[key] = value
+
+    return data
+
+def get_paths_changes(prefix, value, loaded, paths, data_set, data_unset):
+    """ Changes of the dictionary loaded only by the paths inside """
+
+    tree = get_tree(paths)
+
+    for key in {**loaded, **value}:
+        path = f'{prefix}.{key}'
+        el = value.get(key)
+
+        if el is None:
+            if key in loaded:
+                data_unset.add(path)
+            continue
+
+        if tree.get(key) and isinstance(el, dict):
+            get_paths_changes(
+                path,
+                el,
+                loaded[key] if isinstance(loaded.get(key), dict) else {},
+                tree[key],
+                data_set,
+                data_unset,
+            )
+        elif el != loaded.get(key, MISSING):
+            data_set[path] = rm_none(el)
+
+def trim_sliced(data, partial):
+    """ Leave paths inside sliced lists of the DB document """
+
+    for key, (paths, window) in partial.items():
+        if (
+            paths is not None and window is not None
+            and isinstance(data.get(key), list)
+        ):
+            data[key] = trim(data[key], paths)
+
+    return data
+
+def get_fields(fields, partial):
+    """ Fields & slices of getting by the projection """
+
+    slices = {}
+
+    if fields is not None:
+        fields = set(fields)
+
+    for key, (paths, window) in partial.items():
+        if window is not None:
+            slices[key] = window
+
+        if paths is not None and fields is not None:
+            fields.discard(key)
+            fields |= {f'{key}.{path}' for path in paths}
+
+    return fields, slices or None
@@ -0,0 +1,160 @@
+"""
+Typed conditions of DB requests
+"""
+
+from ..errors import ErrorInvalid
+
+
+# Suffixes of terms: name -> DB operator
+OPERATORS = {
+    'ne': '$ne',
+    'in': '$in',
+    'nin': '$nin',
+    'gt': '$gt',
+    'gte': '$gte',
+    'lt': '$lt',
+    'lte': '$lte',
+    'exists': '$exists',
+    # NOTE: Half-open range `(start, stop)`, `None` bound isn't limited
+    'range': None,
+}
+
+
+def check_field(model, name):
+    """ Check that the path starts with a field of the model """
+
+    if name.split('.', 1)[0] not in model._fields:
+        raise ErrorInvalid(name)
+
+    return name
+
+def _get_term(key, value):
+    """ Get the path & the DB condition of the term """
+
+    name, _, suffix = key.rpartition('__')
+
+    if not name or suffix not in OPERATORS:
+        name, suffix = key, None
+
+    # NOTE: Paths inside fields are separated by `__` as in arguments
+    name = name.replace('__', '.')
+
+    if suffix is None:
+        return name, value
+
+    if suffix in ('in', 'nin'):
+        value = list(value)
+
+    if suffix == 'range':
+        start, stop = value
+        condition = {}
+
+        if start is not None:
+            condition['$gte'] = start
+        if stop is not None:
+            condition['$lt'] = stop
+
+        return name, condition
+
+    return name, {OPERATORS[suffix]: value}
+
+
+class Query:
+    """ Condition & order of getting instances
+
+    Terms are field names with optional operator suffixes, e.g.
+    `Query(login='onigiri') | Query(created__range=(start, None))`,
+    they are checked by fields of the model and compiled into one DB filter
+
+    The order & the index are of the whole query, e.g.
+    `(Query(...) | Query(...)).sort(('created', -1)).hint('created_-1')`
+    """
+
+    def __init__(self, **terms):
+        self.terms = terms
+        self.operator = None
+        self.queries = ()
+        # Keys of sorting: `(field, direction)` or the field for ascending
+        self.sorting = ()
+        # Index for the DB request: name or keys
+        self.index = None
+
+    @classmethod
+    def _combine(cls, operator, queries):
+        query = cls()
+        query.operator = operator
+        query.queries = tuple(
+            el
+            for query in queries
+            for el in (
+                query.queries if query.operator == operator else (query,)
+            )
+        )
+        return query
+
+    @classmethod
+    def any(cls, *queries):
+        """ Match any of the queries """
+
+        return cls._combine('$or', queries)
+
+    @classmethod
+    def all(cls, *queries):
+        """ Match all of the queries """
+
+        return cls._combine('$and', queries)
+
+    def sort(self, *keys):
+        """ Sort by the keys before the `id` order """
+
+        self.sorting = keys
+        return self
+
+    def hint(self, index):
+        """ Use the index for the DB request """
+
+        self.index = index
+        return self
+
+    def __or__(self, other):
+        return self.any(self, other)
+
+    def __and__(self, other):
+        return self.all(self, other)
+
+    def __repr__(self):
+        if self.operator is None:
+            return f"Query({self.terms!r})"
+        return f"Query({self.operator}, {list(self.queries)!r})"
+
+    def compile(self, model):
+        """ Make the DB condition for the model """
+
+        if self.operator is None:
+            db_condition = {}
+
+            for key, value in self.terms.items():
+                name, condition = _get_term(key, value)
+                check_field(model, name)
+
+                # NOTE: Several operators of one field are merged
+                if (
+                    isinstance(condition, dict)
+                    and isinstance(db_condition.get(name), dict)
+                ):
+                    db_condition[name] = {**db_condition[name], **condition}
+                else:
+                    db_condition[name] = condition
+
+            return db_condition
+
+        if not self.queries:
+            # NOTE: No alternatives match nothing, no requirements match all
+            return {'id': {'$in': []}} if self.operator == '$or' else {}
+
+        if len(self.queries) == 1:
+            return self.queries[0].compile(model)
+
+        return {
+            self.operator: [query.compile(model) for query in self.queries],
+        }
@@ -0,0 +1,146 @@
+"""
+Trigram index for searching by substrings
+"""
+
+import time
+
+from pymongo import UpdateOne, DeleteOne
+
+from ..funcs.mongodb import db
+
+
+# Length of indexed substrings
+# NOTE: Not more than the minimum length of the search query
+GRAM = 3
+
+
+def _get_texts(value):
+    """ Get all searchable texts of the value """
+
+    if isinstance(value, str):
+        return [value.lower()]
+
+    if isinstance(value, bool):
+        return []
+
+    # NOTE: Numbers are matched only entirely
+    if isinstance(value, (int, float)):
+        if value == int(value):
+            return [str(int(value))]
+        return []
+
+    if isinstance(value, (list, tuple, set)):
+        return [text for el in value for text in _get_texts(el)]
+
+    if isinstance(value, dict):
+        return [text for el in value.values() for text in _get_texts(el)]
+
+    return []
+
+def get_grams(text):
+    """ Get substrings of the text for the index """
+
+    return {text[i:i+GRAM] for i in range(len(text) - GRAM + 1)}
+
+def get_data_grams(data, fields):
+    """ Get substrings of the searchable fields of the document """
+
+    grams = set()
+
+    for field in fields:
+        if field in data:
+            for text in _get_texts(data[field]):
+                grams |= get_grams(text)
+
+    return grams
+
+def find(name, search):
+    """ Get IDs of the documents, which contain all substrings of the query
+
+    The documents should be checked by the query itself,
+    because substrings can be located separately
+    """
+
+    grams = sorted(get_grams(search.lower()))
+
+    return [
+        el['id']
+        for el in db.grams.find(
+            {'db': name, 'grams': {'$all': grams}},
+            {'_id': False, 'id': True},
+        )
+    ]
+
+def update(name, id_, data, fields, new=False):
+    """ Update substrings of the document in the index """
+
+    update_many(name, [(id_, data, new)], fields)
+
+def update_many(name, els, fields):
+    """ Update substrings of the documents in the index by one request
+
+    `els` are tuples of ID, data and whether the document is new
+    """
+
+    requests = []
+
+    for id_, data, new in els:
+        grams = get_data_grams(data, fields)
+
+        if grams:
+            requests.append(UpdateOne(
+                {'db': name, 'id': id_},
+                {'$set': {'grams': sorted(grams), 'updated': time.time()}},
+                upsert=True,
+            ))
+
+        elif not new:
+            requests.append(DeleteOne({'db': name, 'id': id_}))
+
+    if requests:
+        db.grams.bulk_write(requests, ordered=False)
+
+def remove(name, id_):
+    """ Remove the document from the index """
+
+    db.grams.delete_one({'db': name, 'id': id_})
+
+def remove_many(name, ids):
+    """ Remove the documents from the index """
+
+    db.grams.delete_many({'db': name, 'id': {'$in': list(ids)}})
+
+def rebuild(name, fields, batch_size=1000):
+    """ Rebuild the index of the collection from the existing data """
+
+    started = time.time()
+    requests = []
+    db_filter = {'_id': False, 'id': True, **{field: True for field in fields}}
+
+    for el in db[name].find({}, db_filter).batch_size(batch_size):
+        grams = get_data_grams(el, fields)
+
+        if not grams:
+            continue
+
+        requests.append(UpdateOne(
+            {'db': name, 'id': el['id']},
+            {'$set': {'grams': sorted(grams), 'updated': time.time()}},
+            upsert=True,
+        ))
+
+        if len(requests) >= batch_size:
+            db.grams.bulk_write(requests, ordered=False)
+            requests = []
+
+    if requests:
+        db.grams.bulk_write(requests, ordered=False)
+
+    # Documents, which were deleted or lost their searchable values
+    db.grams.delete_many({'db': name, 'updated': {'$lt': started}})
+
+def ensure_indexes():
+    """ Create indexes of the index collection """
+
+    db.grams.create_index([('db', 1), ('id', 1)], unique=True)
+    db.grams.create_index([('db', 1), ('grams', 1)])
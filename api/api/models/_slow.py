@@ -0,0 +1,90 @@
+"""
+Log of slow DB requests with plans of their queries
+"""
+
+import time
+import json
+import threading
+from contextlib import contextmanager
+
+from ..funcs.mongodb import db, sets
+from ..funcs._reports import report
+from ..funcs._stats import get_shape
+
+
+# Seconds of the DB request to explain its query
+SLOW_TIME = sets.get('slow', 0.1)
+
+# Shapes of explained queries: (collection, shape)
+_explained = set()
+_explained_lock = threading.Lock()
+
+
+def _get_stages(plan):
+    """ Chain of stages of the plan from the last one """
+
+    stages = []
+
+    while plan:
+        stage = plan.get('stage')
+
+        if plan.get('indexName'):
+            stage = f"{stage} {plan['indexName']}"
+
+        stages.append(stage)
+        plan = plan.get('inputStage') or (plan.get('inputStages') or [None])[0]
+
+    return stages
+
+def _explain(collection, condition, projection, sort, hint):
+    """ Report the plan of the query """
+
+    els = db[collection].find(condition, projection)
+
+    if sort:
+        els = els.sort(sort)
+
+    if hint is not None:
+        els = els.hint(hint)
+
+    plan = els.explain()
+    stats = plan.get('executionStats') or {}
+    stages = _get_stages(plan.get('queryPlanner', {}).get('winningPlan'))
+
+    report.warning(
+        "Collection scan" if 'COLLSCAN' in stages else "Slow query",
+        {
+            'collection': collection,
+            'query': json.dumps(get_shape(condition), sort_keys=True),
+            'plan': ' < '.join(stages),
+            'docs': stats.get('totalDocsExamined'),
+            'keys': stats.get('totalKeysExamined'),
+            'returned': stats.get('nReturned'),
+        },
+        tags=['slow'],
+    )
+
+@contextmanager
+def track(collection, condition, projection=None, sort=None, hint=None):
+    """ Explain the query once by its shape if the request is slow """
+
+    start = time.time()
+    yield
+
+    if time.time() - start < SLOW_TIME:
+        return
+
+    key = (collection, json.dumps(get_shape(condition), sort_keys=True))
+
+    with _explained_lock:
+        if key in _explained:
+            return
+
+        _explained.add(key)
+
+    try:
+        _explain(collection, condition, projection, sort, hint)
+
+    # NOTE: The log doesn't break the request
+    except Exception as e:
+        report.error("Query explanation", {'error': e, 'key': key})
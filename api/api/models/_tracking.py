@@ -0,0 +1,94 @@
+"""
+Tracking of in-place changes of list fields
+"""
+
+from copy import deepcopy
+
+
+class TrackedList(list):
+    """ List field, which marks the field of the instance as changed
+
+    Added elements are remembered to push only them,
+    other changes make the field changed entirely
+    """
+
+    __slots__ = ('_dirty', '_name')
+
+    def __init__(self, value, dirty, name):
+        super().__init__(value)
+        # Changed fields of the instance, see `ChangesMixin._dirty`
+        self._dirty = dirty
+        self._name = name
+
+    def _push(self, els):
+        dirty = self._dirty
+
+        if self._name not in dirty:
+            dirty[self._name] = list(els)
+        elif dirty[self._name] is not None:
+            dirty[self._name].extend(els)
+
+    def _change(self):
+        self._dirty[self._name] = None
+
+    def append(self, el):
+        super().append(el)
+        self._push([el])
+
+    def extend(self, els):
+        els = list(els)
+        super().extend(els)
+        self._push(els)
+
+    def __iadd__(self, els):
+        self.extend(els)
+        return self
+
+    def insert(self, index, el):
+        super().insert(index, el)
+        self._change()
+
+    def pop(self, index=-1):
+        el = super().pop(index)
+        self._change()
+        return el
+
+    def remove(self, el):
+        super().remove(el)
+        self._change()
+
+    def clear(self):
+        super().clear()
+        self._change()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._change()
+
+    def reverse(self):
+        super().reverse()
+        self._change()
+
+    def __setitem__(self, index, el):
+        super().__setitem__(index, el)
+        self._change()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._change()
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._change()
+        return self
+
+    # NOTE: Copies are plain lists without the instance
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(list(self), memo)
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self),))
@@ -2,7 +2,31 @@
 Action model of User object
 """
 
+import os
+import time
+import asyncio
+import atexit
+import threading
+
+from pymongo import UpdateOne, DeleteMany, InsertOne
+from pymongo.errors import BulkWriteError
+
+from ..funcs.mongodb import db
+from ..funcs._reports import report
 from . import Base, Attribute
+from .user import User, COLLECTION as USERS
+
+
+# Collection of buckets of actions in the DB
+COLLECTION = 'actions'
+# Max count of actions in one document of the collection
+BUCKET_SIZE = 100
+# Seconds of the period of actions in one document of the collection
+BUCKET_TIME = 7 * 24 * 60 * 60
+# Count of buffered actions to write them without waiting for the interval
+FLUSH_SIZE = 100
+# Seconds of keeping buffered actions before writing them
+FLUSH_TIME = 5
 
 
 class Action(Base):
@@ -12,3 +36,240 @@ class Action(Base):
 
     id = Attribute(types=str)
     details = Attribute(types=dict, default={})
+
+
+class Actions(Base):
+    """ Bucket of actions of the user
+
+    Append-only documents of actions by users & periods, so that user
+    documents don't grow with the history of the account
+    """
+
+    _db = COLLECTION
+    _indexes = (
+        {'fields': [('user', 1), ('bucket', -1)]},
+    )
+
+    bucket = Attribute(types=int)
+    size = Attribute(types=int, default=0)
+    actions = Attribute(types=list, default=[]) # TODO: list[Action]
+
+
+# Actions of the process waiting for writing: [(user, action)]
+_buffer = []
+_buffer_lock = threading.Lock()
+_buffer_time = 0
+# Process of the thread writing buffered actions by the interval
+_flushing = None
+
+
+def _get_bucket(created):
+    return int(created // BUCKET_TIME)
+
+def _get_chunks(buffer):
+    """ Group actions by users & buckets into chunks of the bucket size """
+
+    groups = {}
+
+    for user, action in buffer:
+        key = (user, _get_bucket(action.get('created') or 0))
+        groups.setdefault(key, []).append(action)
+
+    for (user, bucket), actions in groups.items():
+        for i in range(0, len(actions), BUCKET_SIZE):
+            yield user, bucket, actions[i:i+BUCKET_SIZE]
+
+def _flush_regularly():
+    """ Write buffered actions of the idle process by the interval """
+
+    while True:
+        time.sleep(FLUSH_TIME)
+
+        try:
+            flush_actions()
+        except Exception as e:
+            report.error("Actions writing", {'error': e})
+
+def _start_flushing():
+    """ Start the writing thread in the process once """
+
+    global _flushing # pylint: disable=global-statement
+
+    # NOTE: Threads are not inherited by forked processes of workers
+    if _flushing != os.getpid():
+        _flushing = os.getpid()
+        threading.Thread(target=_flush_regularly, daemon=True).start()
+
+def add_action(user, action):
+    """ Remember the action of the user to write it with others """
+
+    if isinstance(action, Action):
+        action = action.json(default=False)
+
+    global _buffer_time # pylint: disable=global-statement
+
+    with _buffer_lock:
+        _start_flushing()
+
+        if not _buffer:
+            _buffer_time = time.time()
+
+        _buffer.append((user, action))
+        full = (
+            len(_buffer) >= FLUSH_SIZE
+            or time.time() - _buffer_time >= FLUSH_TIME
+        )
+
+    if full:
+        flush_actions()
+
+def flush_actions():
+    """ Write the buffered actions by one request """
+
+    global _buffer # pylint: disable=global-statement
+
+    with _buffer_lock:
+        buffer, _buffer = _buffer, []
+
+    if not buffer:
+        return
+
+    now = time.time()
+    requests = []
+    chunks = []
+
+    for user, bucket, actions in _get_chunks(buffer):
+        chunks.append([(user, action) for action in actions])
+        # NOTE: A full bucket isn't matched, so the next one is created
+        # NOTE: Migrated buckets are replaced on repeated migrations
+        requests.append(UpdateOne(
+            {
+                'user': user,
+                'bucket': bucket,
+                'size': {'$lte': BUCKET_SIZE - len(actions)},
+                'migrated': {'$exists': False},
+            },
+            {
+                '$push': {'actions': {'$each': actions}},
+                '$inc': {'size': len(actions)},
+                '$setOnInsert': {'created': now},
+                '$set': {'updated': now},
+            },
+            upsert=True,
+        ))
+
+    # NOTE: Not written actions are returned to the buffer for the next try
+    try:
+        db[COLLECTION].bulk_write(requests, ordered=False)
+
+    except BulkWriteError as e:
+        failed = [
+            action
+            for error in e.details['writeErrors']
+            for action in chunks[error['index']]
+        ]
+
+        with _buffer_lock:
+            _buffer[:0] = failed
+
+        raise
+
+    except Exception:
+        with _buffer_lock:
+            _buffer[:0] = buffer
+
+        raise
+
+# NOTE: Actions of the last seconds are written on the exit of the process
+atexit.register(flush_actions)
+
+def get_actions(user, count=None, cursor=None):
+    """ Get actions of the user from the newest ones
+
+    `cursor` is the creation time of the last received action,
+    actions of other processes are got after writing them in `FLUSH_TIME`
+    """
+
+    flush_actions()
+
+    condition = {'user': user}
+    if cursor is not None:
+        condition['bucket'] = {'$lte': _get_bucket(cursor)}
+
+    buckets = db[COLLECTION].find(
+        condition,
+        {'_id': False, 'bucket': True, 'actions': True},
+        sort=[('bucket', -1)],
+    )
+
+    actions = []
+    last = None
+
+    for bucket in buckets:
+        # NOTE: Actions of the next periods are older than received ones
+        if (
+            count is not None
+            and len(actions) >= count
+            and bucket['bucket'] != last
+        ):
+            break
+
+        last = bucket['bucket']
+
+        for action in bucket['actions']:
+            if cursor is None or (action.get('created') or 0) < cursor:
+                actions.append(action)
+
+    actions.sort(key=lambda action: action.get('created') or 0, reverse=True)
+
+    if count is not None:
+        actions = actions[:count]
+
+    return [Action(action, fields=set()) for action in actions]
+
+def migrate_actions():
+    """ Move actions embedded in user documents into the collection
+
+    Repeatable: the actions of the user migrated before are replaced
+    """
+
+    users = db[USERS].find(
+        {'actions': {'$exists': True}},
+        {'_id': False, 'id': True, 'actions': True},
+    )
+
+    for user in users:
+        requests = [DeleteMany({'user': user['id'], 'migrated': True})]
+        groups = ((user['id'], action) for action in user['actions'])
+        now = time.time()
+
+        for user_id, bucket, actions in _get_chunks(groups):
+            requests.append(InsertOne({
+                'user': user_id,
+                'bucket': bucket,
+                'size': len(actions),
+                'actions': actions,
+                'created': now,
+                'updated': now,
+                'migrated': True,
+            }))
+
+        db[COLLECTION].bulk_write(requests)
+        db[USERS].update_one(
+            {'id': user['id']},
+            {'$unset': {'actions': ''}},
+        )
+        User.invalidate([user['id']])
+
+
+# Async
+
+async def aadd_action(*args, **kwargs):
+    """ Remember the action without blocking the event loop """
+
+    return await asyncio.to_thread(add_action, *args, **kwargs)
+
+async def aget_actions(*args, **kwargs):
+    """ Get actions of the user without blocking the event loop """
+
+    return await asyncio.to_thread(get_actions, *args, **kwargs)
@@ -11,6 +11,8 @@ class Post(Base):
 
     _db = 'posts'
     _search_fields = {'name', 'cont', 'tags'}
+    _heavy_fields = {'cont'}
+    _cache_size = 100
 
     cont = Attribute(types=str, default='', processing=reimg)
     reactions = Attribute(types=dict, default={
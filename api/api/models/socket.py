@@ -9,6 +9,8 @@ class Socket(Base):
     """ Socket """
 
     _db = 'sockets'
+    _search_fields = set()
 
-    id = Attribute(types=str)
-    token = Attribute(types=str)
+    id = Attribute(types=str, unique=True)
+    user = Attribute(types=int, default=0, index=True)
+    token = Attribute(types=str, index=True)
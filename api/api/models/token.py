@@ -9,5 +9,6 @@ class Token(Base):
     """ Token """
 
     _db = 'tokens'
+    _search_fields = set()
 
-    id = Attribute(types=str)
+    id = Attribute(types=str, unique=True)
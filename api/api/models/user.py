@@ -5,11 +5,13 @@ User model of DB object
 import re
 import hashlib
 
-from . import Base, Attribute
+from . import Base, Attribute, Query
 from ..funcs import load_image, get_language
-from ..funcs.mongodb import db
 
 
+# Collection of users in the DB
+COLLECTION = 'users'
+
 RESERVED = {
     'admin', 'admins', 'administrator', 'administrators', 'administration',
     'author', 'support', 'manager', 'client',
@@ -29,12 +31,10 @@ def default_login(instance):
     return f"id{instance.id}"
 
 def check_login(id_, cont):
-    """ Login checking """
+    """ Login checking
 
-    # Already registered
-    users = db.users.find_one({'login': cont}, {'_id': True, 'id': True})
-    if users and users['id'] != id_:
-        return False
+    Registered logins are checked by the unique index on saving
+    """
 
     # Invalid login
 
@@ -112,19 +112,14 @@ def pre_process_phone(cont):
 
     return int(re.sub(r'[^0-9]', '', cont))
 
+# pylint: disable=unused-argument
 def check_mail(id_, cont):
-    """ Mail checking """
+    """ Mail checking
 
-    # Invalid
-    if re.match(r'.+@.+\..+', cont) is None:
-        return False
+    Registered mails are checked by the unique index on saving
+    """
 
-    # Already registered
-    users = db.users.find_one({'mail': cont}, {'_id': False, 'id': True})
-    if users and users['id'] != id_:
-        return False
-
-    return True
+    return re.match(r'.+@.+\..+', cont) is not None
 
 def process_title(cont):
     """ Make a value with a capital letter """
@@ -136,6 +131,27 @@ def process_lower(cont):
 
     return cont.lower()
 
+def query_login(cont):
+    """ Condition of the user by the login, mail or phone
+
+    Logins have letters, mails have `@`, so the phone is checked only
+    without them, and only one user is matched
+    """
+
+    queries = [
+        Query(login=process_login(cont)),
+        Query(mail=process_lower(cont)),
+    ]
+
+    # NOTE: Digits of logins & mails aren't phones of other users
+    if not re.search(r'[a-zA-Z@]', cont):
+        try:
+            queries.append(Query(phone=pre_process_phone(cont)))
+        except ValueError:
+            pass
+
+    return Query.any(*queries)
+
 def default_status(instance):
     """ Default status """
 
@@ -155,7 +171,7 @@ def default_status(instance):
 class User(Base):
     """ User """
 
-    _db = 'users'
+    _db = COLLECTION
     _search_fields = {
         'login',
         'name',
@@ -163,14 +179,18 @@ class User(Base):
         'phone',
         'mail',
         'description',
-        # 'actions',
     }
+    _indexes = (
+        {'fields': [('social.id', 1), ('social.user', 1)]},
+    )
+    _heavy_fields = {'online', 'social'}
 
     login = Attribute(
         types=str,
         default=default_login,
         checking=check_login,
         processing=process_login,
+        unique=True,
     )
     password = Attribute(
         types=str,
@@ -192,12 +212,14 @@ class User(Base):
         types=int,
         checking=check_phone,
         pre_processing=pre_process_phone,
+        index=True,
     )
     phone_verified = Attribute(types=bool, default=True)
     mail = Attribute(
         types=str,
         checking=check_mail,
         processing=process_lower,
+        unique=True,
     )
     mail_verified = Attribute(types=bool, default=True)
     social = Attribute(types=list, default=[]) # TODO: list[{}] # TODO: checking
@@ -208,7 +230,6 @@ class User(Base):
         pre_processing=get_language,
     )
     status = Attribute(types=int, default=default_status)
-    actions = Attribute(types=list, default=[]) # TODO: list[dict]
     online = Attribute(types=list, default=[]) # TODO: list[tuple]
     # TODO: UTM / promo
     # TODO: discount
@@ -75,6 +75,13 @@ api = API(
     **sets,
 )
 
+## Startup
+@app.on_event('startup')
+async def startup():
+    """ Prepare the API before requests """
+
+    await api.start()
+
 ## Endpoints
 ### Main
 class Input(BaseModel):
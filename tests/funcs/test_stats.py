@@ -0,0 +1,75 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from api.funcs import _stats
+from api.funcs._stats import Listener, BudgetExceeded, track_method, \
+                             get_stats, track_queries, check_queries
+
+
+def _call(listener, command, reply, request_id):
+    event = SimpleNamespace(
+        command_name=next(iter(command)),
+        command=command,
+        connection_id=('localhost', 27017),
+        request_id=request_id,
+        duration_micros=2000,
+        reply=reply,
+    )
+    listener.started(event)
+    listener.succeeded(event)
+
+def test_track_method():
+    listener = Listener()
+
+    with track_method('tests.stats') as usage:
+        _call(listener, {'find': 'tests'}, {'cursor': {'firstBatch': [
+            {'id': 1}, {'id': 2},
+        ]}}, 1)
+
+        # NOTE: Calls of threads without the context are out of the method
+        thread = threading.Thread(target=_call, args=(
+            listener, {'update': 'tests'}, {'n': 1}, 2,
+        ))
+        thread.start()
+        thread.join()
+
+    assert usage.calls == 1
+    assert usage.docs == 2
+    assert usage.commands == {('tests', 'find'): 1}
+
+    stats = get_stats()
+    method = stats['methods']['tests.stats']
+
+    assert method['db_calls']['count'] == 1
+    assert method['db_docs']['sum'] == 2
+    assert any(
+        el['method'] is None and el['command'] == 'update'
+        for el in stats['commands']
+    )
+
+def test_repeated_queries(monkeypatch):
+    listener = Listener()
+    reports = []
+
+    monkeypatch.setattr(
+        _stats.report,
+        'warning',
+        lambda text, extra, tags: reports.append(extra),
+    )
+
+    with track_queries() as queries:
+        _call(listener, {'find': 'users', 'filter': {'id': 1}}, {}, 1)
+
+        for i in range(3):
+            _call(listener, {'find': 'reviews', 'filter': {'id': i}}, {}, 2)
+
+    assert len(queries) == 4
+
+    check_queries('tests.queries', queries, budget=5)
+
+    assert [el['collection'] for el in reports] == ['reviews']
+
+    with pytest.raises(BudgetExceeded):
+        check_queries('tests.queries', queries, budget=3, strict=True)
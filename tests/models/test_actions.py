@@ -0,0 +1,101 @@
+import time
+import random
+
+import pytest
+
+from api.funcs.mongodb import db
+from api.models.user import User
+from api.models import action as action_module
+from api.models.action import Action, add_action, flush_actions, \
+                              get_actions, migrate_actions, BUCKET_SIZE, \
+                              COLLECTION
+
+
+def _get_user():
+    return random.randint(10 ** 8, 10 ** 9)
+
+
+def test_buckets():
+    user = _get_user()
+
+    for i in range(BUCKET_SIZE + 5):
+        add_action(user, Action(name='auth', details={'i': i}))
+
+    flush_actions()
+
+    buckets = list(db[COLLECTION].find({'user': user}))
+
+    assert sorted(bucket['size'] for bucket in buckets) == [5, BUCKET_SIZE]
+
+    add_action(user, Action(name='auth', details={'i': BUCKET_SIZE + 5}))
+    flush_actions()
+
+    assert db[COLLECTION].count_documents({'user': user}) == 2
+
+def test_paging():
+    user = _get_user()
+
+    for i in range(7):
+        add_action(user, Action(name='auth', created=1000 + i, details={'i': i}))
+
+    # NOTE: Buffered actions are written before reading
+    actions = get_actions(user, count=3)
+
+    assert [action.details['i'] for action in actions] == [6, 5, 4]
+    assert isinstance(actions[0], Action)
+
+    actions = get_actions(user, count=3, cursor=actions[-1].created)
+
+    assert [action.details['i'] for action in actions] == [3, 2, 1]
+
+    actions = get_actions(user, count=3, cursor=actions[-1].created)
+
+    assert [action.details['i'] for action in actions] == [0]
+
+def test_migration():
+    user = User(login=f'u{_get_user()}')
+    user.save()
+
+    actions = [
+        Action(name='auth', details={'i': i}).json(default=False)
+        for i in range(3)
+    ]
+    db[User._db].update_one({'id': user.id}, {'$set': {'actions': actions}})
+
+    migrate_actions()
+    migrate_actions()
+
+    assert [action.details['i'] for action in get_actions(user.id)] \
+        == [2, 1, 0]
+    assert 'actions' not in db[User._db].find_one({'id': user.id})
+
+def test_flush_failed(monkeypatch):
+    user = _get_user()
+    collection = type(db[COLLECTION])
+    bulk_write = collection.bulk_write
+
+    def fail(*args, **kwargs):
+        raise ConnectionError()
+
+    monkeypatch.setattr(collection, 'bulk_write', fail)
+    add_action(user, Action(name='auth'))
+
+    with pytest.raises(ConnectionError):
+        flush_actions()
+
+    # NOTE: Not written actions are kept for the next try
+    monkeypatch.setattr(collection, 'bulk_write', bulk_write)
+    flush_actions()
+
+    assert len(get_actions(user)) == 1
+
+def test_flush_idle(monkeypatch):
+    monkeypatch.setattr(action_module, 'FLUSH_TIME', 0.1)
+    monkeypatch.setattr(action_module, '_flushing', None)
+
+    user = _get_user()
+    add_action(user, Action(name='auth'))
+    time.sleep(0.5)
+
+    # NOTE: Written by the thread without the next action or reading
+    assert db[COLLECTION].count_documents({'user': user}) == 1
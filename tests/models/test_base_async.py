@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from api.errors import ErrorWrong
+from api.models import Base, Attribute
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+
+    meta = Attribute(types=str)
+    delta = Attribute(types=str, default='')
+    extra = Attribute(types=str, default=lambda instance: f'u{instance.delta}o')
+    multi = Attribute(types=list, default=[])
+
+
+def test_async_save_get():
+    async def handle():
+        instance = ObjectModel(
+            name='test_async',
+            meta='onigiri',
+        )
+        await instance.asave()
+
+        return instance, await ObjectModel.aget(ids=instance.id)
+
+    instance, recieved = asyncio.run(handle())
+
+    assert instance.id > 0
+    assert isinstance(recieved, ObjectModel)
+    assert recieved.id == instance.id
+    assert recieved.name == 'test_async'
+    assert recieved.meta == 'onigiri'
+
+def test_async_reload():
+    instance = ObjectModel(
+        delta='hinkali',
+    )
+    instance.save()
+
+    async def handle():
+        recieved1 = await ObjectModel.aget(ids=instance.id, fields={'delta'})
+        recieved2 = await ObjectModel.aget(ids=instance.id, fields={'delta'})
+
+        recieved1.delta = 'hacapuri'
+        await recieved1.asave()
+        await recieved2.areload()
+
+        return recieved2
+
+    recieved = asyncio.run(handle())
+
+    assert recieved.delta == 'hacapuri'
+
+def test_async_load():
+    instance = ObjectModel(
+        meta='onigiri',
+        delta='hinkali',
+    )
+    instance.save()
+
+    async def handle():
+        recieved = await ObjectModel.aget(ids=instance.id, fields={'delta'})
+        await recieved.aload('meta')
+        return recieved
+
+    recieved = asyncio.run(handle())
+
+    # NOTE: Loaded fields are got without requests to the DB
+    assert 'meta' in recieved._specified_fields
+    assert recieved.meta == 'onigiri'
+    assert recieved.delta == 'hinkali'
+
+def test_async_rm():
+    instance = ObjectModel()
+    instance.save()
+
+    asyncio.run(instance.arm())
+
+    with pytest.raises(ErrorWrong):
+        asyncio.run(ObjectModel.aget(ids=instance.id))
+
+def test_async_rm_sub():
+    instance = ObjectModel(
+        multi=[{'id': 'a', 'taiga': 1}, {'id': 'b', 'taiga': 2}],
+    )
+    instance.save()
+
+    asyncio.run(instance.arm_sub('multi', 'a'))
+
+    assert instance.multi == [{'id': 'b', 'taiga': 2}]
+
+def test_async_iter():
+    instances = [ObjectModel(name='test_async_iter') for _ in range(5)]
+
+    for instance in instances:
+        instance.save()
+
+    async def handle():
+        return [
+            el.id
+            async for el in ObjectModel.aiter(
+                batch_size=2,
+                fields={},
+                name='test_async_iter',
+            )
+        ]
+
+    assert asyncio.run(handle()) == [el.id for el in instances[::-1]]
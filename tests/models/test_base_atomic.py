@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from api.errors import ErrorWrong, ErrorUnsaved
+from api.models import Base, Attribute
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+
+    meta = Attribute(types=str)
+    count = Attribute(types=int, default=0)
+    multi = Attribute(types=list, default=[])
+
+
+def test_push():
+    instance = ObjectModel(multi=[1])
+    instance.save()
+
+    instance.push('multi', 2, 3)
+    instance.push('multi', 4, cap=3)
+
+    assert instance.multi == [2, 3, 4]
+    assert instance._dirty == {}
+
+    recieved = ObjectModel.get(ids=instance.id)
+
+    assert recieved.multi == [2, 3, 4]
+    assert recieved.updated == instance.updated
+
+    ObjectModel.push(instance.id, 'multi', 5)
+
+    assert ObjectModel.get(ids=instance.id).multi == [2, 3, 4, 5]
+
+def test_pull():
+    instance = ObjectModel(multi=[{'id': 1}, {'id': 2}, {'id': 3}])
+    instance.save()
+
+    instance.pull('multi', [1, 3])
+
+    assert instance.multi == [{'id': 2}]
+    assert ObjectModel.get(ids=instance.id).multi == [{'id': 2}]
+
+def test_inc_set():
+    instance = ObjectModel(meta='onigiri')
+    instance.save()
+
+    recieved = ObjectModel.get(ids=instance.id, fields={'meta'})
+    ObjectModel.inc(instance.id, 'count', 2)
+    recieved.inc('count')
+    recieved.set_field('meta', 'ramen')
+
+    assert recieved.meta == 'ramen'
+    assert not ObjectModel._fields['count'].is_set(recieved)
+    # NOTE: Got on access
+    assert recieved.count == 3
+
+    recieved = ObjectModel.get(ids=instance.id)
+
+    assert recieved.count == 3
+    assert recieved.meta == 'ramen'
+
+    with pytest.raises(TypeError):
+        recieved.set_field('meta', 1)
+
+def test_atomic_unsaved():
+    with pytest.raises(ErrorWrong):
+        ObjectModel.inc(0, 'count')
+
+    with pytest.raises(ErrorUnsaved):
+        ObjectModel().push('multi', 1)
+
+def test_atomic_async():
+    instance = ObjectModel()
+    instance.save()
+
+    asyncio.run(instance.apush('multi', 1))
+    asyncio.run(ObjectModel.ainc(instance.id, 'count'))
+
+    recieved = ObjectModel.get(ids=instance.id)
+
+    assert recieved.multi == [1]
+    assert recieved.count == 1
@@ -0,0 +1,89 @@
+import pytest
+
+from api.errors import ErrorWrong, ErrorUnsaved
+from api.models import Base, Attribute
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+
+    meta = Attribute(types=str)
+    delta = Attribute(types=str, default='')
+    extra = Attribute(types=str, default=lambda instance: f'u{instance.delta}o')
+    multi = Attribute(types=list, default=[])
+
+
+def test_save_many():
+    instance1 = ObjectModel(name='test_save_many', meta='onigiri')
+    instance1.save()
+
+    instance1 = ObjectModel.get(ids=instance1.id)
+    instance1.meta = 'hinkali'
+    instance1.multi = [{'id': 'a', 'taiga': 1}]
+    instance2 = ObjectModel(name='test_save_many', delta='ramen')
+
+    ObjectModel.save_many([instance1, instance2])
+
+    assert instance2.id > instance1.id
+
+    recieved1, recieved2 = ObjectModel.get(ids=[instance2.id, instance1.id])
+
+    assert recieved1.delta == 'ramen'
+    assert recieved2.meta == 'hinkali'
+    assert recieved2.multi == [{'id': 'a', 'taiga': 1}]
+
+    # Resaving doesn't duplicate subobjects
+    recieved2.multi.append({'id': 'b', 'taiga': 2})
+    ObjectModel.save_many([recieved2, instance1], ordered=False)
+
+    recieved = ObjectModel.get(ids=instance1.id)
+
+    assert recieved.multi == [
+        {'id': 'a', 'taiga': 1},
+        {'id': 'b', 'taiga': 2},
+    ]
+
+def test_save_many_removed():
+    instance1 = ObjectModel(name='test_save_many_removed')
+    instance2 = ObjectModel(name='test_save_many_removed')
+    ObjectModel.save_many([instance1, instance2])
+
+    instance1, instance2 = ObjectModel.get(ids=[instance1.id, instance2.id])
+    ObjectModel.get(ids=instance1.id).rm()
+    instance1.meta = 'onigiri'
+    instance2.meta = 'hinkali'
+
+    with pytest.raises(ErrorUnsaved):
+        ObjectModel.save_many([instance1, instance2])
+
+    # The rest are written
+    assert ObjectModel.get(ids=instance2.id).meta == 'hinkali'
+
+    with pytest.raises(ErrorWrong):
+        ObjectModel.get(ids=instance1.id)
+
+def test_insert_many():
+    instances = [
+        ObjectModel(name='test_insert_many', meta=str(i))
+        for i in range(3)
+    ]
+
+    ObjectModel.insert_many(instances)
+
+    recieved = ObjectModel.get(name='test_insert_many')
+
+    assert [el.meta for el in recieved] == ['2', '1', '0']
+    assert all(el._loaded_values for el in instances)
+
+def test_rm_many():
+    instances = [ObjectModel(name='test_rm_many') for _ in range(3)]
+    ObjectModel.insert_many(instances)
+
+    ObjectModel.rm_many([instances[0], instances[1].id])
+
+    recieved = ObjectModel.get(name='test_rm_many')
+
+    assert [el.id for el in recieved] == [instances[2].id]
+
+    with pytest.raises(ErrorWrong):
+        ObjectModel.rm_many([instances[0].id, instances[2].id])
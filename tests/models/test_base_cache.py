@@ -0,0 +1,73 @@
+import pytest
+
+from api.errors import ErrorWrong
+from api.models import Base, Attribute
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+    _cache_size = 2
+
+    meta = Attribute(types=str)
+    delta = Attribute(types=str, default='')
+    multi = Attribute(types=list, default=[])
+
+
+def test_cache_hit():
+    instance = ObjectModel(meta='onigiri', delta='hinkali')
+    instance.save()
+
+    stats = ObjectModel.cache_stats()
+
+    recieved1 = ObjectModel.get(ids=instance.id)
+    recieved2 = ObjectModel.get(ids=instance.id)
+    recieved3 = ObjectModel.get(ids=instance.id, fields={'meta'})
+
+    assert recieved1 is not recieved2
+    assert recieved2.meta == 'onigiri'
+    assert recieved3.meta == 'onigiri'
+    assert recieved3._specified_fields == {'id', 'meta'}
+
+    # Received instances do not change the cache
+    recieved2.multi.append({'id': 1})
+    assert ObjectModel.get(ids=instance.id).multi == []
+
+    new_stats = ObjectModel.cache_stats()
+    assert new_stats['misses'] == stats['misses'] + 1
+    assert new_stats['hits'] == stats['hits'] + 3
+
+def test_cache_invalidation():
+    instance = ObjectModel(meta='onigiri', multi=[{'id': 1}, {'id': 2}])
+    instance.save()
+
+    recieved = ObjectModel.get(ids=instance.id)
+    recieved.meta = 'ramen'
+    recieved.save()
+
+    assert ObjectModel.get(ids=instance.id).meta == 'ramen'
+
+    recieved.rm_sub('multi', 1)
+
+    assert ObjectModel.get(ids=instance.id).multi == [{'id': 2}]
+
+    ObjectModel.save_many([ObjectModel(id=instance.id, meta='hinkali')])
+
+    assert ObjectModel.get(ids=instance.id).meta == 'hinkali'
+
+    recieved.rm()
+
+    with pytest.raises(ErrorWrong):
+        ObjectModel.get(ids=instance.id)
+
+def test_cache_eviction():
+    instances = [ObjectModel(meta=str(i)) for i in range(3)]
+    ObjectModel.save_many(instances)
+
+    ObjectModel.get(ids=[el.id for el in instances])
+    stats = ObjectModel.cache_stats()
+
+    assert stats['size'] == 2
+
+    ObjectModel.get(ids=instances[0].id)
+
+    assert ObjectModel.cache_stats()['misses'] == stats['misses'] + 1
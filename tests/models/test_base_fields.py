@@ -1,3 +1,4 @@
+from api.funcs.mongodb import db
 from api.models import Base, Attribute
 
 
@@ -10,6 +11,10 @@ class ObjectModel(Base):
     multi = Attribute(types=list, default=[])
 
 
+class HeavyModel(ObjectModel):
+    _heavy_fields = {'multi'}
+
+
 def test_get_with_fields():
     instance = ObjectModel(
         meta='onigiri',
@@ -20,11 +25,16 @@ def test_get_with_fields():
     recieved = ObjectModel.get(ids=instance.id, fields={'delta'})
 
     assert recieved.id == instance.id
-    assert recieved.meta is None
-    assert recieved.delta == 'hinkali'
+    assert recieved.json(fields=recieved._specified_fields) == {
+        'id': instance.id,
+        'delta': 'hinkali',
+    }
+
+    # NOTE: Not loaded fields are got on access
+    assert recieved.meta == 'onigiri'
     assert recieved.extra == 'uhinkalio'
-    assert recieved.created is None
-    assert recieved.updated is None
+    assert recieved.created == instance.created
+    assert recieved.updated == instance.updated
 
 def test_save_none_with_fields():
     instance = ObjectModel(
@@ -107,10 +117,130 @@ def test_reload_with_fields():
         'multi',
     }
     assert recieved.id == instance.id
-    assert recieved.name is None
     assert recieved.meta == 'onigiri'
-    assert recieved.delta == '' # default
-    assert recieved.extra == 'uo' # default
     assert recieved.multi == [4, 5, 6] # new
-    assert recieved.created is None
-    assert recieved.updated is None
+    assert recieved.extra == 'uhacapurio' # default by the got field
+    assert recieved.delta == 'hacapuri' # got on access
+    assert recieved.name == 'test_reload_fields' # got on access
+
+def test_dirty_fields():
+    instance = ObjectModel(meta='onigiri', delta='hinkali', multi=[{'id': 1}])
+    instance.save()
+
+    recieved = ObjectModel.get(ids=instance.id)
+    recieved.multi.append({'id': 2})
+    recieved.meta = 'ramen'
+
+    assert recieved._dirty == {'multi': [{'id': 2}], 'meta': None}
+    assert recieved._get_changes() == (
+        {'meta': 'ramen'}, set(), {'multi': [{'id': 2}]}, {},
+    )
+
+    recieved.save()
+
+    assert recieved._dirty == {}
+    assert recieved._loaded_values['multi'] == [{'id': 1}, {'id': 2}]
+
+    recieved.multi.pop(0)
+    recieved.delta = ''
+
+    assert recieved._get_changes() == (
+        {}, {'delta'}, {}, {'multi': {'id': {'$in': [1]}}},
+    )
+
+def test_dirty_not_subobjects():
+    instance = ObjectModel(multi=[1])
+    instance.save()
+
+    recieved1 = ObjectModel.get(ids=instance.id, fields={'multi'})
+    recieved2 = ObjectModel.get(ids=instance.id, fields={'multi'})
+
+    recieved1.multi.append(2)
+    recieved1.save()
+    recieved2.multi += [3]
+    recieved2.save()
+
+    assert ObjectModel.get(ids=instance.id).multi == [1, 2, 3]
+
+def test_undeclared_fields():
+    instance = ObjectModel(meta='onigiri')
+    instance.save()
+
+    db.tests.update_one({'id': instance.id}, {'$set': {'legacy': 1}})
+
+    recieved = ObjectModel.get(ids=instance.id)
+    recieved.meta = 'ramen'
+    recieved.save()
+
+    assert db.tests.find_one({'id': instance.id})['legacy'] == 1
+
+def test_heavy_fields():
+    instance = HeavyModel(meta='onigiri', multi=[1, 2])
+    instance.save()
+
+    recieved = HeavyModel.get(ids=instance.id)
+
+    assert 'multi' not in recieved._loaded_values
+    assert recieved.meta == 'onigiri'
+
+    # NOTE: Got on the first access
+    assert recieved.multi == [1, 2]
+    assert recieved._loaded_values['multi'] == [1, 2]
+    assert recieved._dirty == {}
+
+    recieved = HeavyModel.get(ids=instance.id, fields={'multi'})
+
+    assert recieved._loaded_values['multi'] == [1, 2]
+
+    # NOTE: Not got if it is set or deleted
+    recieved = HeavyModel.get(ids=instance.id)
+    del recieved.multi
+    recieved.save()
+
+    assert HeavyModel.get(ids=instance.id, fields={'multi'}).multi == []
+
+def test_heavy_fields_json():
+    instance = HeavyModel(meta='onigiri', multi=[1, 2])
+    instance.save()
+
+    # NOTE: Not loaded fields aren't serialized as default values
+    recieved = HeavyModel.get(ids=instance.id)
+
+    assert 'multi' not in recieved.json()
+    assert recieved.json()['meta'] == 'onigiri'
+
+    recieved = HeavyModel.get(ids=instance.id, fields={'id', 'multi'})
+
+    assert recieved.json()['multi'] == [1, 2]
+    assert 'meta' not in recieved.json()
+
+    recieved.load()
+
+    assert recieved.json()['meta'] == 'onigiri'
+
+def test_missing_fields_batch(monkeypatch):
+    instances = [
+        ObjectModel(name='test_batch', meta=f'onigiri{i}', multi=[i])
+        for i in range(3)
+    ]
+    for instance in instances:
+        instance.save()
+
+    recieved = ObjectModel.get(name='test_batch', fields={'name'})
+
+    requests = []
+    get_db = ObjectModel._get_db
+    monkeypatch.setattr(
+        ObjectModel,
+        '_get_db',
+        staticmethod(
+            lambda *args, **kwargs:
+            requests.append(args) or get_db(*args, **kwargs)
+        ),
+    )
+
+    # NOTE: All missing fields of all the instances by one request
+    assert recieved[0].meta == 'onigiri2'
+    assert [el.multi for el in recieved] == [[2], [1], [0]]
+    assert [el.meta for el in recieved] == ['onigiri2', 'onigiri1', 'onigiri0']
+    assert len(requests) == 1
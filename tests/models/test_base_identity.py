@@ -0,0 +1,107 @@
+import asyncio
+
+from api.models import Base, Attribute, unit_of_work
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+
+    meta = Attribute(types=str)
+    delta = Attribute(types=str, default='')
+    extra = Attribute(types=str, default=lambda instance: f'u{instance.delta}o')
+    multi = Attribute(types=list, default=[])
+
+
+def test_identity_same():
+    instance = ObjectModel(meta='onigiri', delta='hinkali')
+    instance.save()
+
+    async def handle():
+        async with unit_of_work():
+            recieved1 = ObjectModel.get(ids=instance.id, fields={'meta'})
+            recieved2 = ObjectModel.get(ids=instance.id, fields={'meta'})
+            recieved3 = ObjectModel.get(ids=[instance.id])[0]
+
+            return recieved1, recieved2, recieved3
+
+    recieved1, recieved2, recieved3 = asyncio.run(handle())
+
+    assert recieved1 is recieved2 is recieved3
+    assert recieved1._specified_fields is None
+    assert recieved1.meta == 'onigiri'
+    assert recieved1.delta == 'hinkali'
+
+def test_identity_widen_changed():
+    instance = ObjectModel(meta='onigiri', delta='hinkali')
+    instance.save()
+
+    async def handle():
+        async with unit_of_work():
+            recieved = ObjectModel.get(ids=instance.id, fields={'meta'})
+            recieved.meta = 'ramen'
+            recieved.multi.append({'id': 'a'})
+
+            return ObjectModel.get(ids=instance.id, fields={'delta', 'multi'})
+
+    recieved = asyncio.run(handle())
+
+    assert {'id', 'meta', 'delta', 'multi'} <= recieved._specified_fields
+    assert recieved.meta == 'ramen'
+    assert recieved.delta == 'hinkali'
+    assert recieved.multi == [{'id': 'a'}]
+
+def test_identity_defer():
+    instance = ObjectModel(meta='onigiri')
+    instance.save()
+
+    async def handle():
+        async with unit_of_work():
+            recieved = ObjectModel.get(ids=instance.id, fields={'meta'})
+            recieved.meta = 'ramen'
+            recieved.save(defer=True)
+
+            created = ObjectModel(meta='hinkali')
+            created.save(defer=True)
+
+            assert created.id
+            assert ObjectModel.get(ids=instance.id).meta == 'ramen'
+
+            return created
+
+    created = asyncio.run(handle())
+
+    assert ObjectModel.get(ids=instance.id).meta == 'ramen'
+    assert ObjectModel.get(ids=created.id).meta == 'hinkali'
+
+def test_identity_defer_fail():
+    instance = ObjectModel(meta='onigiri')
+    instance.save()
+
+    async def handle():
+        async with unit_of_work():
+            recieved = ObjectModel.get(ids=instance.id)
+            recieved.meta = 'ramen'
+            recieved.save(defer=True)
+
+            raise ValueError('meta')
+
+    try:
+        asyncio.run(handle())
+    except ValueError:
+        pass
+
+    assert ObjectModel.get(ids=instance.id).meta == 'onigiri'
+
+def test_without_identity():
+    instance = ObjectModel()
+    instance.save()
+
+    recieved1 = ObjectModel.get(ids=instance.id)
+    recieved2 = ObjectModel.get(ids=instance.id)
+
+    assert recieved1 is not recieved2
+
+    recieved1.meta = 'ramen'
+    recieved1.save(defer=True)
+
+    assert ObjectModel.get(ids=instance.id).meta == 'ramen'
@@ -0,0 +1,111 @@
+import pytest
+
+from api.funcs import report
+from api.errors import ErrorRepeat
+from api.models import Base, Attribute
+from api.funcs.mongodb import db
+
+
+class IndexedModel(Base):
+    _db = 'tests_indexes'
+    _indexes = (
+        {'fields': [('multi.id', 1), ('multi.taiga', -1)]},
+    )
+
+    meta = Attribute(types=str, index=True)
+    delta = Attribute(types=str, unique=True)
+    multi = Attribute(types=list, default=[])
+
+
+def _keys():
+    return {
+        tuple((field, int(direction)) for field, direction in info['key']): info
+        for info in db[IndexedModel._db].index_information().values()
+    }
+
+def test_declared_indexes():
+    assert IndexedModel._get_indexes() == {
+        (('id', 1),): {'unique': True, 'sparse': True},
+        (('meta', 1),): {},
+        (('delta', 1),): {'unique': True, 'sparse': True},
+        (('multi.id', 1), ('multi.taiga', -1)): {},
+    }
+
+def test_ensure_indexes(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(
+        report, 'warning', lambda text, extra=None: warnings.append(text),
+    )
+
+    db[IndexedModel._db].drop()
+    db[IndexedModel._db].create_index([('extra', 1)])
+
+    IndexedModel.ensure_indexes()
+    indexes = _keys()
+
+    assert indexes[(('id', 1),)]['unique']
+    assert indexes[(('delta', 1),)]['unique']
+    assert (('meta', 1),) in indexes
+    assert (('multi.id', 1), ('multi.taiga', -1)) in indexes
+    assert warnings == ["Extra index"]
+
+    warnings.clear()
+    IndexedModel.ensure_indexes()
+
+    assert len(_keys()) == len(indexes)
+    assert warnings == ["Extra index"]
+
+def test_unique():
+    IndexedModel.ensure_indexes()
+
+    instance1 = IndexedModel(delta='onigiri')
+    instance1.save()
+
+    # NOTE: Checked by the unique index on saving
+    instance2 = IndexedModel(delta='onigiri')
+
+    with pytest.raises(ErrorRepeat) as error:
+        instance2.save()
+
+    assert error.value.txt == 'delta'
+
+    with pytest.raises(ErrorRepeat):
+        IndexedModel.save_many([IndexedModel(delta='onigiri')])
+
+    instance3 = IndexedModel(delta='hinkali')
+    instance3.save()
+
+    with pytest.raises(ErrorRepeat):
+        instance3.set_field('delta', 'onigiri')
+
+def test_unique_without_startup():
+    class UniqueModel(Base):
+        _db = 'tests_unique'
+
+        meta = Attribute(types=str, unique=True)
+
+    db[UniqueModel._db].drop()
+
+    # NOTE: Unique indexes are created before the first writing
+    UniqueModel(meta='onigiri').save()
+
+    with pytest.raises(ErrorRepeat):
+        UniqueModel(meta='onigiri').save()
+
+def test_unique_bulk_written():
+    IndexedModel.ensure_indexes()
+
+    IndexedModel(delta='hacapuri').save()
+    instance = IndexedModel(multi=[1])
+    instance.save()
+
+    instance = IndexedModel.get(ids=instance.id)
+    instance.multi.append(2)
+
+    with pytest.raises(ErrorRepeat):
+        IndexedModel.save_many([instance, IndexedModel(delta='hacapuri')])
+
+    # NOTE: Written changes before the error aren't repeated
+    instance.save()
+
+    assert IndexedModel.get(ids=instance.id).multi == [1, 2]
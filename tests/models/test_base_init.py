@@ -3,7 +3,7 @@ import json
 
 import pytest
 
-from api.models import Base, Attribute
+from api.models import Base, Attribute, IDS_BLOCK
 
 
 class ObjectModel(Base):
@@ -91,6 +91,20 @@ def test_kwargs():
     assert instance.delta == 'HINKali'
     assert instance.extra == 'RAMEN'
 
+def test_compact():
+    instance1 = ObjectModel()
+    instance2 = ObjectModel()
+
+    assert not hasattr(instance1, '__dict__')
+
+    with pytest.raises(AttributeError):
+        instance1.undefined_field = 1
+
+    instance1.multi.append(1)
+
+    assert instance2.multi == []
+    assert ObjectModel.multi == []
+
 def test_create_empty():
     instance = ObjectModel()
 
@@ -112,6 +126,17 @@ def test_create():
     assert instance.id > 0
     assert instance.updated < now + 1
 
+def test_create_ids():
+    instances = [ObjectModel() for _ in range(IDS_BLOCK + 2)]
+
+    for instance in instances:
+        instance.save()
+
+    ids = [instance.id for instance in instances]
+
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
 def test_init_print():
     instance = ObjectModel(
         meta='onigiri',
@@ -133,3 +158,21 @@ def test_init_print():
         'created': instance.created,
         'updated': None,
     }
+
+def test_json():
+    instance = ObjectModel(
+        meta='onigiri',
+        multi=[{'id': 1, 'taiga': None}],
+    )
+
+    assert instance.json(default=False, fields={'meta', 'multi', 'delta'}) == {
+        'meta': 'onigiri',
+        'multi': [{'id': 1}],
+    }
+
+    data = instance.json(none=True)
+    assert data['name'] is None
+    assert data['multi'] == [{'id': 1, 'taiga': None}]
+
+    instance.json()['multi'].append({'id': 2})
+    assert instance.multi == [{'id': 1, 'taiga': None}]
@@ -2,7 +2,7 @@ import time
 
 import pytest
 
-from api.errors import ErrorWrong
+from api.errors import ErrorWrong, ErrorInvalid, ErrorUnsaved
 from api.models import Base, Attribute
 
 
@@ -81,6 +81,96 @@ def test_list():
         assert recieved2.created < now + 1
         assert recieved2.updated < now + 1
 
+def test_list_count_offset():
+    instances = [ObjectModel(name='test_list_count') for _ in range(5)]
+
+    for instance in instances:
+        instance.save()
+
+    recieved = ObjectModel.get(count=2, offset=1, name='test_list_count')
+
+    assert [el.id for el in recieved] == [instances[3].id, instances[2].id]
+    assert ObjectModel.count(name='test_list_count') == 5
+
+def test_server_counts():
+    for name in ('test_counts_1', 'test_counts_1', 'test_counts_2'):
+        ObjectModel(name=name, meta='test_counts').save()
+
+    assert ObjectModel.exists(meta='test_counts')
+    assert not ObjectModel.exists(meta='test_counts_none')
+    assert sorted(ObjectModel.distinct('name', meta='test_counts')) \
+        == ['test_counts_1', 'test_counts_2']
+    assert ObjectModel.aggregate([
+        {'$match': {'meta': 'test_counts'}},
+        {'$group': {'_id': '$name', 'count': {'$sum': 1}}},
+        {'$sort': {'_id': 1}},
+    ]) == [
+        {'_id': 'test_counts_1', 'count': 2},
+        {'_id': 'test_counts_2', 'count': 1},
+    ]
+
+def test_list_cursor():
+    instances = [ObjectModel(name='test_list_cursor') for _ in range(5)]
+
+    for instance in instances:
+        instance.save()
+
+    recieved1 = ObjectModel.get(count=2, name='test_list_cursor')
+    recieved2 = ObjectModel.get(
+        count=2,
+        cursor=recieved1[-1].id,
+        name='test_list_cursor',
+    )
+
+    assert [el.id for el in recieved1] == [instances[4].id, instances[3].id]
+    assert [el.id for el in recieved2] == [instances[2].id, instances[1].id]
+
+    # New instances don't shift the next pages
+    ObjectModel(name='test_list_cursor').save()
+    recieved3 = ObjectModel.get(
+        count=2,
+        cursor=recieved2[-1].id,
+        name='test_list_cursor',
+    )
+
+    assert [el.id for el in recieved3] == [instances[0].id]
+
+def test_iter():
+    instances = [ObjectModel(name='test_iter') for _ in range(5)]
+
+    for instance in instances:
+        instance.save()
+
+    recieved = ObjectModel.iter(batch_size=2, fields={'name'}, name='test_iter')
+
+    assert not isinstance(recieved, list)
+
+    recieved = list(recieved)
+
+    assert [el.id for el in recieved] == [el.id for el in instances[::-1]]
+    assert all(el._specified_fields == {'id', 'name'} for el in recieved)
+    assert all(
+        not ObjectModel._fields['created'].is_set(el) for el in recieved
+    )
+
+def test_search():
+    instance1 = ObjectModel(name='Test_Search_Onigiri')
+    instance1.save()
+    instance2 = ObjectModel(name='test_search_hinkali')
+    instance2.save()
+
+    recieved = ObjectModel.get(search='SEARCH_ONIGIRI')
+
+    assert [el.id for el in recieved] == [instance1.id]
+    assert ObjectModel.count(search='test_search_') == 2
+
+    recieved = ObjectModel.get(search='test_search_', count=1, fields={'name'})
+
+    assert [el.name for el in recieved] == ['test_search_hinkali']
+
+    with pytest.raises(ErrorInvalid):
+        ObjectModel.get(search='on')
+
 def test_update():
     instance = ObjectModel(
         name='test_create',
@@ -162,6 +252,21 @@ def test_rm():
     with pytest.raises(ErrorWrong):
         ObjectModel.get(ids=instance.id)
 
+def test_rm_resave():
+    instance = ObjectModel(meta='onigiri')
+    instance.save()
+
+    instance = ObjectModel.get(ids=instance.id)
+    ObjectModel.get(ids=instance.id).rm()
+    instance.delta = 'hinkali'
+
+    # NOTE: The deleted instance isn't restored by changes
+    with pytest.raises(ErrorUnsaved):
+        instance.save()
+
+    with pytest.raises(ErrorWrong):
+        ObjectModel.get(ids=instance.id)
+
 def test_rm_nondb():
     instance = ObjectModel()
 
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from api.errors import ErrorUnsaved
+from api.models import Base, Attribute, unit_of_work
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+
+    meta = Attribute(types=str)
+    multi = Attribute(types=list, default=[])
+    extra = Attribute(types=dict, default={})
+
+
+class CachedModel(ObjectModel):
+    _cache_size = 10
+
+
+def _make(model=ObjectModel):
+    instance = model(
+        meta='onigiri',
+        multi=[{'id': i, 'x': i, 'y': -i} for i in range(1, 5)],
+        extra={'a': 1, 'b': {'c': 2, 'd': 3}},
+    )
+    instance.save()
+    return instance
+
+def test_paths():
+    instance = _make()
+
+    recieved = ObjectModel.get(ids=instance.id, fields={'multi.x', 'extra.b.c'})
+
+    assert recieved.multi == [{'x': 1}, {'x': 2}, {'x': 3}, {'x': 4}]
+    assert recieved.extra == {'b': {'c': 2}}
+    assert not ObjectModel._fields['meta'].is_set(recieved)
+    assert recieved.json(fields={'multi.y'}) == {'multi': [{}, {}, {}, {}]}
+
+def test_slices():
+    instance = _make()
+
+    recieved = ObjectModel.get(ids=instance.id, slices={'multi': -1})
+
+    assert recieved.meta == 'onigiri'
+    assert recieved.multi == [{'id': 4, 'x': 4, 'y': -4}]
+
+    recieved = ObjectModel.get(
+        ids=instance.id,
+        fields={'multi.y'},
+        slices={'multi': (1, 2)},
+    )
+
+    assert recieved.multi == [{'y': -2}, {'y': -3}]
+    assert recieved._specified_fields == {'id', 'multi'}
+
+def test_cached_slices():
+    instance = _make(CachedModel)
+
+    # NOTE: The full document is narrowed without the DB
+    CachedModel.get(ids=instance.id)
+    misses = CachedModel.cache_stats()['misses']
+
+    recieved = CachedModel.get(
+        ids=instance.id,
+        fields={'multi.x'},
+        slices={'multi': -2},
+    )
+
+    assert recieved.multi == [{'x': 3}, {'x': 4}]
+    assert CachedModel.cache_stats()['misses'] == misses
+
+def test_save_partial():
+    instance = _make()
+
+    recieved = ObjectModel.get(
+        ids=instance.id,
+        fields={'multi', 'extra.b.c'},
+        slices={'multi': -1},
+    )
+
+    recieved.multi.append({'id': 5, 'x': 5})
+    recieved.extra['b']['c'] = 4
+    recieved.extra['e'] = 5
+    recieved.save()
+
+    recieved = ObjectModel.get(ids=instance.id)
+
+    assert [el['id'] for el in recieved.multi] == [1, 2, 3, 4, 5]
+    assert recieved.extra == {'a': 1, 'b': {'c': 4, 'd': 3}, 'e': 5}
+
+def test_save_partial_subobjects():
+    instance = _make()
+
+    recieved = ObjectModel.get(ids=instance.id, slices={'multi': -2})
+    recieved.multi.pop()
+    recieved.save()
+
+    assert [el['id'] for el in ObjectModel.get(ids=instance.id).multi] \
+        == [1, 2, 3]
+
+    # NOTE: Elements without IDs can't be matched with the DB
+    recieved = ObjectModel.get(ids=instance.id, fields={'multi.x'})
+    recieved.multi.pop()
+
+    with pytest.raises(ErrorUnsaved):
+        recieved.save()
+
+    # NOTE: Set subobjects are added to the existing ones
+    recieved.multi = [{'id': 6}]
+    recieved.save()
+
+    assert [el['id'] for el in ObjectModel.get(ids=instance.id).multi] \
+        == [1, 2, 3, 6]
+
+def test_reload_partial():
+    instance = _make()
+
+    recieved = ObjectModel.get(
+        ids=instance.id,
+        fields={'multi.x'},
+        slices={'multi': -1},
+    )
+    instance.push('multi', {'id': 5, 'x': 5})
+    recieved.reload()
+
+    assert recieved.multi == [{'x': 5}]
+    assert not ObjectModel._fields['meta'].is_set(recieved)
+
+def test_identity_partial():
+    instance = _make()
+
+    async def handle():
+        async with unit_of_work():
+            return (
+                ObjectModel.get(ids=instance.id, slices={'multi': -1}),
+                ObjectModel.get(ids=instance.id, slices={'multi': -1}),
+                ObjectModel.get(ids=instance.id, fields={'multi'}),
+            )
+
+    recieved1, recieved2, recieved3 = asyncio.run(handle())
+
+    assert recieved1 is recieved2 is recieved3
+    assert len(recieved3.multi) == 4
+    assert recieved3._partial_fields is None
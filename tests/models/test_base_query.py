@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from api.errors import ErrorInvalid
+from api.models import Base, Attribute, Query
+from api.models.user import User, query_login
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+
+    meta = Attribute(types=str)
+    rank = Attribute(types=int, default=0)
+    extra = Attribute(types=dict, default={})
+
+
+def _make(meta, ranks):
+    instances = [
+        ObjectModel(meta=meta, rank=rank, extra={'rank': rank})
+        for rank in ranks
+    ]
+
+    for instance in instances:
+        instance.save()
+
+    return instances
+
+def test_compile():
+    query = (
+        Query(rank__range=(1, None), rank__ne=3)
+        | Query(meta__in={'onigiri'}) | Query(extra__rank__exists=False)
+    ) & Query(meta='test')
+
+    assert query.compile(ObjectModel) == {'$and': [
+        {'$or': [
+            {'rank': {'$gte': 1, '$ne': 3}},
+            {'meta': {'$in': ['onigiri']}},
+            {'extra.rank': {'$exists': False}},
+        ]},
+        {'meta': 'test'},
+    ]}
+
+    with pytest.raises(ErrorInvalid):
+        Query(rnak__gt=1).compile(ObjectModel)
+
+def test_get_query():
+    instances = _make('test_query', [1, 2, 3, 4, 5])
+
+    recieved = ObjectModel.get(
+        meta='test_query',
+        query=Query(rank__range=(2, 4)) | Query(extra__rank=5),
+    )
+
+    assert [el.id for el in recieved] \
+        == [instances[4].id, instances[2].id, instances[1].id]
+    assert ObjectModel.count(
+        meta='test_query', query=Query(rank__lte=2),
+    ) == 2
+
+def test_get_sort():
+    instances = _make('test_sort', [2, 1, 2, 3])
+
+    recieved = ObjectModel.get(
+        meta='test_sort', query=Query().sort(('rank', 1)), count=3,
+    )
+
+    assert [el.id for el in recieved] \
+        == [instances[1].id, instances[2].id, instances[0].id]
+
+    with pytest.raises(ErrorInvalid):
+        ObjectModel.get(meta='test_sort', query=Query().sort('rnak'))
+
+    with pytest.raises(ErrorInvalid):
+        ObjectModel.get(meta='test_sort', query=Query().sort('rank'), cursor=1)
+
+def test_query_login():
+    phone = random.randint(7 * 10 ** 10, 8 * 10 ** 10 - 1)
+    owner = User(login=f'a{phone}', mail=f'{phone}@x.ru')
+    owner.save()
+    other = User(phone=phone)
+    other.save()
+
+    # NOTE: Digits of the login & the mail aren't matched with phones
+    for login in (f'a{phone}', f'{phone}@x.ru'):
+        assert [el.id for el in User.get(query=query_login(login))] \
+            == [owner.id]
+
+    assert [el.id for el in User.get(query=query_login(f'+{phone}'))] \
+        == [other.id]
@@ -0,0 +1,52 @@
+from api.models import Base, Attribute
+from api.funcs.mongodb import db
+
+
+class SearchModel(Base):
+    _db = 'tests_search'
+    _search_fields = {'name', 'meta', 'multi'}
+
+    meta = Attribute(types=int)
+    multi = Attribute(types=list, default=[])
+
+
+def _ids(search):
+    return [el.id for el in SearchModel.get(search=search)]
+
+def test_search_create():
+    instance = SearchModel(
+        name='Onigiri with Salmon',
+        meta=79001234567,
+        multi=['hinkali', 'ramen'],
+    )
+    instance.save()
+
+    assert _ids('GIRI WITH') == [instance.id]
+    assert _ids('kali') == [instance.id]
+    assert _ids('79001234567') == [instance.id]
+    assert _ids('7900123') == []
+    assert _ids('giri salmon') == []
+
+def test_search_update():
+    instance = SearchModel(name='test_search_update')
+    instance.save()
+
+    instance = SearchModel.get(ids=instance.id, fields={'name'})
+    instance.name = 'test_search_changed'
+    instance.save()
+
+    assert _ids('search_update') == []
+    assert _ids('search_changed') == [instance.id]
+
+    instance.rm()
+
+    assert _ids('search_changed') == []
+
+def test_search_rebuild():
+    db[SearchModel._db].insert_one({'id': 1000, 'name': 'test_search_rebuild'})
+
+    assert _ids('search_rebuild') == []
+
+    SearchModel.rebuild_search()
+
+    assert _ids('search_rebuild') == [1000]
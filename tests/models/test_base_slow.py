@@ -0,0 +1,35 @@
+from api.models import Base, Attribute, _slow
+
+
+class ObjectModel(Base):
+    _db = 'tests'
+
+    meta = Attribute(types=str)
+
+
+def test_shape():
+    assert _slow.get_shape({
+        'id': {'$in': [1, 2]},
+        '$or': [{'meta': 'a'}, {'extra.rank': {'$gte': 1}}],
+    }) == {
+        'id': {'$in': '?'},
+        '$or': [{'meta': '?'}, {'extra.rank': {'$gte': '?'}}],
+    }
+
+def test_slow_explained_once(monkeypatch):
+    explained = []
+
+    monkeypatch.setattr(_slow, 'SLOW_TIME', 0)
+    monkeypatch.setattr(_slow, '_explained', set())
+    monkeypatch.setattr(_slow, '_explain', lambda *args: explained.append(args))
+
+    instance = ObjectModel(meta='test_slow')
+    instance.save()
+    ObjectModel.get(meta='test_slow_1')
+    ObjectModel.get(meta='test_slow_2')
+    instance.rm()
+
+    conditions = [args[1] for args in explained if args[0] == 'tests']
+
+    assert {'meta': 'test_slow_1'} in conditions
+    assert {'meta': 'test_slow_2'} not in conditions
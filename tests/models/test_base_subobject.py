@@ -1,3 +1,5 @@
+import time
+
 from api.models import Base, Attribute
 
 
@@ -80,8 +82,7 @@ def test_save_sub_partially():
     instance.save()
     recieved1 = ObjectModel.get(ids=instance.id, fields={'delta'})
 
-    assert recieved1.multi == []
-
+    assert not ObjectModel._fields['multi'].is_set(recieved1)
 
     sub2 = SubObject()
     recieved1.multi += [sub2.json(default=False)]
@@ -132,3 +133,27 @@ def test_pull():
     assert instance.multi[0]['id'] == sub2.id
     assert instance.multi[0]['taiga'] == sub2.taiga
     assert instance.multi[1]['id'] == sub3.id
+
+def test_push_existing():
+    sub1 = SubObject(taiga=1)
+    sub2 = SubObject(taiga=2)
+    instance = ObjectModel(multi=[sub1.json(default=False)])
+    instance.save()
+
+    recieved = ObjectModel.get(ids=instance.id, fields={'delta'})
+    recieved.multi = [sub1.json(), sub2.json(default=False)]
+    recieved.save()
+
+    recieved = ObjectModel.get(ids=instance.id)
+
+    assert [el['id'] for el in recieved.multi] == [sub1.id, sub2.id]
+    assert recieved.multi[0] == sub1.json(default=False)
+
+def test_upsert():
+    instance = ObjectModel(id=int(time.time() * 1000), meta='onigiri')
+    instance.save()
+
+    recieved = ObjectModel.get(ids=instance.id)
+
+    assert recieved.meta == 'onigiri'
+    assert recieved.multi == []
@@ -0,0 +1,44 @@
+import sys
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.errors import ErrorWrong
+from api.funcs import get_stats
+from api.funcs.mongodb import db
+from api.models.user import User
+
+
+def test_startup_indexes(monkeypatch):
+    import app # pylint: disable=import-outside-toplevel
+
+    async def background(sio):
+        pass
+
+    # NOTE: Only the DB is prepared without infinite processes
+    monkeypatch.setattr(sys.modules['api'], 'background', background)
+    db[User._db].drop_indexes()
+
+    with TestClient(app.app):
+        pass
+
+    keys = {
+        tuple(field for field, _ in info['key']): info
+        for info in db[User._db].index_information().values()
+    }
+
+    assert keys[('login',)]['unique']
+    assert keys[('mail',)]['unique']
+
+def test_unknown_method_stats():
+    import app # pylint: disable=import-outside-toplevel
+
+    with pytest.raises(ErrorWrong):
+        asyncio.run(app.api.method('tests.unknown'))
+
+    # NOTE: Methods sent by clients don't make histograms for each name
+    methods = get_stats()['methods']
+
+    assert 'tests.unknown' not in methods
+    assert None in methods